@@ -0,0 +1,91 @@
+"""
+Runs the benchmark suite.
+
+Usage: ``python -m benchmarks [--size N] [--repeat N] [--save FILE] [--compare FILE]``
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.corpora import CORPORA
+from benchmarks.suite import FEATURES, compare, run
+
+
+def print_measure(name, feature, measures):
+    print(
+        "{:<16} {:<12} parse {:>8.3f}s  soup_to_draftjs {:>8.3f}s  "
+        "html_to_draftjs {:>8.3f}s  {:>6.2f} MB/s  {:>9.0f} blocks/s  "
+        "peak {:>7.1f} MB".format(
+            name,
+            feature,
+            measures["parse"],
+            measures["soup_to_draftjs"],
+            measures["html_to_draftjs"],
+            measures["mb_per_second"],
+            measures["blocks_per_second"],
+            measures["peak_memory"] / 1e6,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--corpus", action="append", choices=sorted(CORPORA))
+    parser.add_argument("--features", action="append", choices=FEATURES)
+    parser.add_argument("--save", metavar="FILE", help="Save the results as JSON")
+    parser.add_argument(
+        "--compare", metavar="FILE", help="Compare the results against a baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="The relative slowdown considered as a regression (default: 0.1)",
+    )
+    args = parser.parse_args()
+
+    results = run(
+        size=args.size,
+        repeat=args.repeat,
+        corpora=args.corpus,
+        features=args.features or FEATURES,
+        report=print_measure,
+    )
+
+    if args.save:
+        with open(args.save, "w") as fp:
+            json.dump(results, fp, indent=2)
+
+    if not args.compare:
+        return
+
+    with open(args.compare) as fp:
+        baseline = json.load(fp)
+
+    regressions = 0
+    print()
+    for name, feature, metric, previous, current, ratio, regressed in compare(
+        baseline, results, args.tolerance
+    ):
+        regressions += regressed
+        print(
+            "{:<16} {:<12} {:<16} {:>8.3f}s -> {:>8.3f}s  {:>+6.1%}{}".format(
+                name,
+                feature,
+                metric,
+                previous,
+                current,
+                ratio - 1,
+                "  REGRESSION" if regressed else "",
+            )
+        )
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Synthetic HTML documents of different shapes, each stressing
+a different part of the conversion.
+"""
+
+
+def _document(body):
+    return "<html><body>{}</body></html>".format(body)
+
+
+def long_paragraphs(size):
+    """Many flat paragraphs made of text and inline styles."""
+    paragraph = (
+        "<p>Lorem ipsum <b>dolor</b> sit amet, <i>consectetur</i> adipiscing elit, "
+        "sed do <strong>eiusmod <em>tempor</em></strong> incididunt ut labore.</p>\n"
+    )
+    return _document(paragraph * size)
+
+
+def nested_lists(size, depth=20):
+    """Lists nested into each other."""
+    nested = "<ul><li>item <b>bold</b>" * depth + "</li></ul>" * depth
+    return _document((nested + "\n") * size)
+
+
+def image_gallery(size):
+    """Paragraphs full of links and images, producing many entities."""
+    image = (
+        "<a href='https://example.com/{0}'><img src='https://example.com/{0}.png' "
+        "alt='image {0}' width='320' height='240'/></a>"
+    )
+    return _document(
+        "".join("<p>{}</p>\n".format(image.format(i) * 10) for i in range(size))
+    )
+
+
+def empty_wrappers(size):
+    """Blocks wrapping empty blocks, as generated by WYSIWYG editors."""
+    return _document("<div><p></p><div><p><br/></p></div></div><p>text</p>\n" * size)
+
+
+def huge_block(size):
+    """A single block containing a lot of inline runs."""
+    return _document("<p>{}</p>".format("cell <b>value</b> <i>run</i> " * size))
+
+
+CORPORA = {
+    "long_paragraphs": long_paragraphs,
+    "nested_lists": nested_lists,
+    "image_gallery": image_gallery,
+    "empty_wrappers": empty_wrappers,
+    "huge_block": huge_block,
+}
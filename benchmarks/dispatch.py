@@ -0,0 +1,74 @@
+"""
+Measures the cost per node of the conversion of parsed documents.
+
+Usage: ``python -m benchmarks.dispatch [--size N] [--repeat N]``
+"""
+
+import argparse
+import time
+import timeit
+import warnings
+
+import bs4
+
+from html_to_draftjs.converter import SoupConverter
+
+# A mix of all the supported blocks, inline tags and entities
+MIXED_CONTENT = (
+    "<p>Some <b>bold</b>, <i>italic</i> and <strong><em>nested</em></strong> text "
+    "with <a href='https://example.com'>a link</a> and an "
+    "<img src='image.png' width='120'/><br/>on a new line.</p>"
+    "<h2>Title</h2><ul><li>first <em>item</em></li><li>second item</li></ul>"
+    "<blockquote><p>A quote</p></blockquote>"
+)
+
+# Paragraphs made of many short inline runs, dominated by the tags dispatching
+INLINE_CONTENT = "<p>{}</p>".format("<b>x</b><i>y</i><em>z</em><br/>" * 50)
+
+DOCUMENTS = {"mixed": MIXED_CONTENT, "inline": INLINE_CONTENT}
+
+
+def build_document(content, size):
+    return "<div>{}</div>".format(content * size)
+
+
+def count_nodes(soup):
+    return sum(1 for _ in soup.body.descendants)
+
+
+def measure(soup, repeat):
+    """Returns the best time to convert a soup, in seconds."""
+    converter = SoupConverter()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return min(
+            timeit.repeat(
+                lambda: converter.convert(soup).to_dict(),
+                timer=time.process_time,
+                number=1,
+                repeat=repeat,
+            )
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for name, content in DOCUMENTS.items():
+        soup = bs4.BeautifulSoup(build_document(content, args.size), "lxml")
+        nodes = count_nodes(soup)
+        best = measure(soup, args.repeat)
+
+        print(
+            "{}: {} nodes, best of {}: {:.3f}s, {:.0f}ns per node".format(
+                name, nodes, args.repeat, best, best / nodes * 1e9
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Measures the time to import html_to_draftjs in a new interpreter.
+
+Usage: ``python -m benchmarks.imports [--repeat N] [--code CODE] [--top N]``
+
+The import times require Python 3.7 (``-X importtime``), only the lazily
+imported modules are listed before.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+# The modules only imported by the conversions needing them
+LAZY_MODULES = ("bs4", "lxml", "html5lib", "asyncio", "multiprocessing")
+
+
+def imported_modules(code="import html_to_draftjs"):
+    """
+    Runs some code in a new interpreter.
+
+    :return: The names of the modules imported by the interpreter.
+    :rtype: Set[str]
+    """
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            code + "\nimport json, sys; print(json.dumps(sorted(sys.modules)))",
+        ],
+        stdout=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+    return set(json.loads(process.stdout.splitlines()[-1]))
+
+
+def import_times(code="import html_to_draftjs"):
+    """
+    Runs some code in a new interpreter with ``-X importtime``,
+    which requires Python 3.7.
+
+    :return: The self and cumulative import times of the imported modules,
+        in microseconds, by module.
+    :rtype: Dict[str, Tuple[int, int]]
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        self_time, cumulative, module = line.partition(":")[2].split("|")
+        if not self_time.strip().isdigit():
+            continue
+
+        times[module.strip()] = (int(self_time), int(cumulative))
+
+    return times
+
+
+def lazy_imports(modules):
+    """
+    :param modules: The names of the imported modules (or their import times).
+    :type modules: Container[str]
+
+    :return: The modules of ``LAZY_MODULES`` which were imported.
+    :rtype: List[str]
+    """
+    return [module for module in LAZY_MODULES if module in modules]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--code", default="import html_to_draftjs")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    lazy = lazy_imports(imported_modules(args.code))
+    print("lazy modules imported: {}".format(", ".join(lazy) or "none"))
+
+    if sys.version_info < (3, 7):
+        print("The import times require Python 3.7", file=sys.stderr)
+        return
+
+    runs = [import_times(args.code) for _ in range(args.repeat)]
+    best = min(runs, key=lambda times: times["html_to_draftjs"][1])
+
+    print(
+        "html_to_draftjs: best of {}: {:.1f}ms".format(
+            args.repeat, best["html_to_draftjs"][1] / 1000
+        )
+    )
+    for module, (_, cumulative) in sorted(
+        best.items(), key=lambda item: item[1][1], reverse=True
+    )[: args.top]:
+        print("{:>9.1f}ms  {}".format(cumulative / 1000, module))
+
+
+if __name__ == "__main__":
+    main()
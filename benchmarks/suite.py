@@ -0,0 +1,130 @@
+"""
+Times the conversion of the synthetic corpora for every parser backend,
+and compares the results against a baseline.
+"""
+
+import platform
+import time
+import tracemalloc
+import warnings
+
+import bs4
+
+from benchmarks.corpora import CORPORA
+from html_to_draftjs import html_to_draftjs, soup_to_draftjs
+
+FEATURES = ("lxml", "html.parser", "html5lib")
+
+# The metrics compared against the baseline, lower is better
+TIMINGS = ("parse", "soup_to_draftjs", "html_to_draftjs")
+
+
+def best_time(func, repeat):
+    """Returns the best time to run a function, in seconds."""
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def peak_memory(func):
+    """Returns the memory peak reached while running a function, in bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(html, features, repeat):
+    soup = bs4.BeautifulSoup(html, features)
+    result = soup_to_draftjs(soup)
+    size = len(html.encode("utf-8"))
+    conversion_time = best_time(lambda: html_to_draftjs(html, features), repeat)
+
+    return {
+        "bytes": size,
+        "blocks": len(result["blocks"]),
+        "parse": best_time(lambda: bs4.BeautifulSoup(html, features), repeat),
+        "soup_to_draftjs": best_time(lambda: soup_to_draftjs(soup), repeat),
+        "html_to_draftjs": conversion_time,
+        "mb_per_second": size / conversion_time / 1e6,
+        "blocks_per_second": len(result["blocks"]) / conversion_time,
+        "peak_memory": peak_memory(lambda: html_to_draftjs(html, features)),
+    }
+
+
+def run(size=1000, repeat=3, corpora=None, features=FEATURES, report=None):
+    """
+    Runs the benchmarks.
+
+    :param size: The size of the corpora, see :mod:`benchmarks.corpora`.
+    :param repeat: The number of runs of every measure, the best one is kept.
+    :param corpora: The names of the corpora to run, all of them by default.
+    :param features: The parser backends to run.
+    :param report: A callback called with every measure as it completes.
+
+    :return: The results, by corpus and by parser backend.
+    :rtype: dict
+    """
+    results = {}
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+
+        for name in corpora or CORPORA:
+            html = CORPORA[name](size)
+
+            for feature in features:
+                measures = measure(html, feature, repeat)
+                results.setdefault(name, {})[feature] = measures
+
+                if report is not None:
+                    report(name, feature, measures)
+
+    return {
+        "python": platform.python_version(),
+        "size": size,
+        "results": results,
+    }
+
+
+def compare(baseline, current, tolerance=0.1):
+    """
+    Compares the timings of two runs.
+
+    :param tolerance: The relative slowdown above which a timing is a regression.
+
+    :return: The ``(corpus, features, metric, baseline, current, ratio, regressed)``
+        tuples, for every timing present in both runs.
+    :rtype: List[tuple]
+    """
+    comparisons = []
+
+    for name, backends in current["results"].items():
+        for feature, measures in backends.items():
+            previous = baseline["results"].get(name, {}).get(feature)
+            if previous is None:
+                continue
+
+            for metric in TIMINGS:
+                ratio = measures[metric] / previous[metric]
+                comparisons.append(
+                    (
+                        name,
+                        feature,
+                        metric,
+                        previous[metric],
+                        measures[metric],
+                        ratio,
+                        ratio > 1 + tolerance,
+                    )
+                )
+
+    return comparisons
@@ -1,12 +1,310 @@
-import bs4
+from typing import TYPE_CHECKING
 
+from html_to_draftjs.batch import ConversionResult, html_to_draftjs_many  # noqa
+from html_to_draftjs.budget import Budget  # noqa
+from html_to_draftjs.cache import ConversionCache, DiskBackend, MemoryBackend  # noqa
 from html_to_draftjs.converter import SoupConverter
+from html_to_draftjs.diagnostics import Diagnostics, _DeferredWarnings  # noqa
+from html_to_draftjs.exceptions import BudgetExceededError  # noqa
+from html_to_draftjs.files import (  # noqa
+    FALLBACK_ENCODING,
+    decode_html,
+    iter_decoded_chunks,
+    open_html_bytes,
+    sniff_encoding,
+)
+from html_to_draftjs.incremental import IncrementalResult, convert_incremental  # noqa
+from html_to_draftjs.instrumentation import Instrumentation  # noqa
+from html_to_draftjs.model import Block  # noqa
+from html_to_draftjs.selectors import parse_simple_selector
+from html_to_draftjs.stream import STREAM_FEATURES, StreamConverter
 
+# beautifulsoup4, lxml and asyncio are only imported once a conversion needs them
+if TYPE_CHECKING:
+    import bs4
+
+# The converters used by default, they are shared by all the conversions
+_SOUP_CONVERTERS = {strict: SoupConverter(strict=strict) for strict in (False, True)}
+_STREAM_CONVERTERS = {
+    strict: StreamConverter(strict=strict) for strict in (False, True)
+}
+
+# The lxml converters, created on first use
+_LXML_CONVERTERS = {}  # type: dict
+
+# The tree-building backends of ``html_to_draftjs``
+BACKENDS = ("bs4", "lxml")
+
+
+def _get_lxml_converter(strict):
+    converter = _LXML_CONVERTERS.get(strict)
+    if converter is None:
+        from html_to_draftjs.lxml_tree import LxmlConverter
+
+        converter = _LXML_CONVERTERS[strict] = LxmlConverter(strict=strict)
+    return converter
+
+
+def _get_backend(html, features, backend=None, selector=None, simple_selector=None):
+    """
+    :return: The tree-building backend converting the HTML.
+    :rtype: str
+    """
+    # Walk the lxml tree directly, unless the encoding of bytes must be detected
+    # or the selector can only be matched by beautifulsoup4
+    if backend is None:
+        backend = (
+            "lxml"
+            if features == "lxml"
+            and isinstance(html, str)
+            and (selector is None or simple_selector is not None)
+            else "bs4"
+        )
+
+    if backend not in BACKENDS:
+        raise ValueError("Unsupported backend", backend)
+
+    if backend == "lxml" and features != "lxml":
+        raise ValueError("The lxml backend requires the lxml features", features)
+
+    return backend
+
+
+def _start_conversion(
+    html,
+    features,
+    strict,
+    backend,
+    instrumentation=None,
+    diagnostics=None,
+    selector=None,
+    simple_selector=None,
+    budget=None,
+):
+    """
+    Parses the HTML with a tree-building backend, the session of the conversion
+    being created beforehand for its budget to include the parsing.
+
+    :return: The session and the element to convert.
+    :rtype: Tuple[SoupConverter, Optional[Union[bs4.Tag, lxml_tree.LxmlElement]]]
+    """
+    if backend == "lxml":
+        converter = _get_lxml_converter(bool(strict))
+
+        def parse(html):
+            return converter.parse_root(html, selector)
+
+    else:
+        import bs4
+
+        converter = _SOUP_CONVERTERS[bool(strict)]
+
+        # Only build the elements which can be selected, html5lib building
+        # the whole tree anyway
+        parse_only = None
+        if simple_selector is not None and features != "html5lib":
+            parse_only = bs4.SoupStrainer(*simple_selector.to_strainer_args())
+
+        def parse(html):
+            soup = bs4.BeautifulSoup(html, features, parse_only=parse_only)
+            return converter.find_root(soup, selector=selector)
+
+    session = converter.new_session(
+        instrumentation=instrumentation, diagnostics=diagnostics, budget=budget
+    )
+    html = session.limit_input(html)
+
+    if instrumentation is None:
+        root = parse(html)
+    else:
+        with instrumentation.phase("parse"):
+            root = parse(html)
+
+    return session, root
+
+
+def html_to_draftjs(
+    html,
+    features="lxml",
+    strict=False,
+    instrumentation=None,
+    diagnostics=None,
+    cache=None,
+    backend=None,
+    selector=None,
+    budget=None,
+):
+    simple_selector = None if selector is None else parse_simple_selector(selector)
+    backend = _get_backend(html, features, backend, selector, simple_selector)
+
+    # The truncated results are not cached
+    if budget is not None:
+        cache = None
+
+    if cache is not None:
+        converter = _SOUP_CONVERTERS[bool(strict)]
+        key = cache.make_key(html, features, strict, converter, selector)
+        result = cache.get(key)
+        if result is not None:
+            return result
+
+    session, root = _start_conversion(
+        html,
+        features,
+        strict,
+        backend,
+        instrumentation,
+        diagnostics,
+        selector,
+        simple_selector,
+        budget,
+    )
+
+    if instrumentation is None:
+        session.build_block(root)
+    else:
+        with instrumentation.phase("walk"):
+            session.build_block(root)
+
+    result = session.to_dict()
+
+    if cache is not None:
+        cache.set(key, result)
+
+    return result
+
+
+def soup_to_draftjs(
+    soup: "bs4.BeautifulSoup",
+    strict=False,
+    instrumentation=None,
+    diagnostics=None,
+    root=None,
+    selector=None,
+    budget=None,
+):
+    converter = _SOUP_CONVERTERS[bool(strict)]
+    session = converter.convert(
+        soup, instrumentation, diagnostics, root, selector, budget
+    )
+    return session.to_dict()
+
+
+def html_to_draftjs_stream(
+    html, features="lxml", strict=False, instrumentation=None, diagnostics=None
+):
+    converter = _STREAM_CONVERTERS[bool(strict)]
+    return converter.convert(html, features, instrumentation, diagnostics).to_dict()
+
+
+def html_to_draftjs_json(html, features="lxml", strict=False, fp=None):
+    if features in STREAM_FEATURES:
+        session = _STREAM_CONVERTERS[bool(strict)].convert(html, features)
+    else:
+        import bs4
+
+        soup = bs4.BeautifulSoup(html, features)
+        session = _SOUP_CONVERTERS[bool(strict)].convert(soup)
+
+    if fp is None:
+        return session.to_json()
+
+    session.write_json(fp)
+
+
+def html_to_draftjs_iter(html, features="lxml", strict=False):
+    if features in STREAM_FEATURES:
+        return _STREAM_CONVERTERS[bool(strict)].iter_blocks(html, features)
+
+    import bs4
 
-def html_to_draftjs(html, features="lxml", strict=False):
     soup = bs4.BeautifulSoup(html, features)
-    return SoupConverter(strict=strict).convert(soup).to_dict()
+    return _SOUP_CONVERTERS[bool(strict)].iter_blocks(soup)
+
+
+def html_file_to_draftjs(source, encoding=None, features="lxml", strict=False):
+    with open_html_bytes(source) as data:
+        if features not in STREAM_FEATURES:
+            import bs4
+
+            html = decode_html(data, encoding)
+            return soup_to_draftjs(bs4.BeautifulSoup(html, features), strict)
+
+        converter = _STREAM_CONVERTERS[bool(strict)]
+        encoding, start = sniff_encoding(data, encoding)
+
+        # Decode the bytes as UTF-8 if their encoding is not known, only
+        # converting them again as windows-1252 if they are not valid UTF-8.
+        # The warnings are only emitted once the conversion is kept.
+        if encoding is None:
+            deferred = _DeferredWarnings()
+            chunks = iter_decoded_chunks(data, "utf-8", start, errors="strict")
+            try:
+                session = converter.convert_chunks(chunks, features, None, deferred)
+            except UnicodeDecodeError:
+                encoding = FALLBACK_ENCODING
+            else:
+                deferred.emit()
+                return session.to_dict()
+
+        # Decode and feed the bytes by chunks, without copying them as a whole
+        chunks = iter_decoded_chunks(data, encoding, start)
+        return converter.convert_chunks(chunks, features).to_dict()
+
+
+def html_to_draftjs_incremental(
+    previous_html,
+    previous_result,
+    new_html,
+    features="lxml",
+    strict=False,
+    converter=None,
+):
+    if converter is None:
+        if features == "lxml":
+            converter = _get_lxml_converter(bool(strict))
+        else:
+            converter = _SOUP_CONVERTERS[bool(strict)]
+
+    # The lxml converters parse the HTML themselves
+    parse = getattr(converter, "parse_root", None)
+    if parse is None:
+        import bs4
+
+        def parse(html):
+            return converter.find_root(bs4.BeautifulSoup(html, features))
+
+    return convert_incremental(
+        converter, parse, new_html, previous_html, previous_result
+    )
+
+
+def html_to_draftjs_async(
+    html, features="lxml", strict=False, executor=None, semaphore=None
+):
+    from html_to_draftjs import aio
+
+    return aio.html_to_draftjs_async(html, features, strict, executor, semaphore)
+
+
+def html_to_draftjs_many_async(
+    documents,
+    features="lxml",
+    strict=False,
+    executor=None,
+    concurrency=None,
+    ordered=True,
+):
+    from html_to_draftjs import aio
+
+    if concurrency is None:
+        concurrency = aio.DEFAULT_CONCURRENCY
+
+    return aio.html_to_draftjs_many_async(
+        documents, features, strict, executor, concurrency, ordered
+    )
 
 
-def soup_to_draftjs(soup: bs4.BeautifulSoup, strict=False):
-    return SoupConverter(strict=strict).convert(soup).to_dict()
+def html_to_draftjs_push(features="lxml", strict=False, encoding="utf-8"):
+    converter = _STREAM_CONVERTERS[bool(strict)]
+    return converter.new_push_session(features, encoding)
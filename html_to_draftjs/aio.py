@@ -0,0 +1,284 @@
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import os
+import threading
+import weakref
+
+from html_to_draftjs.batch import ConversionResult, _portable_error
+
+__all__ = ["html_to_draftjs_async", "html_to_draftjs_many_async"]
+
+# The number of conversions run at once by default, per event loop
+DEFAULT_CONCURRENCY = os.cpu_count() or 1
+
+# The semaphores limiting the conversions run at once by default, per event loop
+_SEMAPHORES = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+
+
+# Marks the end of the documents
+_END = object()
+
+
+class _ConversionCancelled(Exception):
+    """Raised in the executor to stop a conversion that was cancelled."""
+
+
+def _get_default_semaphore(loop):
+    semaphore = _SEMAPHORES.get(loop)
+    if semaphore is None:
+        semaphore = _SEMAPHORES[loop] = asyncio.Semaphore(DEFAULT_CONCURRENCY)
+    return semaphore
+
+
+def _convert_in_process(html, features, strict):
+    """
+    Converts HTML in a worker process, the errors being replaced by errors
+    that can be sent back to the event loop.
+    """
+    try:
+        return _convert(html, features, strict)
+    except Exception as exc:
+        raise _portable_error(exc) from None
+
+
+def _convert(html, features, strict, cancelled=None):
+    """
+    Converts HTML the same way as :func:`html_to_draftjs.html_to_draftjs`,
+    stopping between two blocks once ``cancelled`` is set.
+    """
+    from html_to_draftjs import _get_backend, _start_conversion
+
+    backend = _get_backend(html, features)
+    session, root = _start_conversion(html, features, strict, backend)
+
+    if root is not None:
+        for _ in session.walk_block(root, None):
+            if cancelled is not None and cancelled.is_set():
+                raise _ConversionCancelled()
+
+    return session.to_dict()
+
+
+async def html_to_draftjs_async(
+    html, features="lxml", strict=False, executor=None, semaphore=None
+):
+    """
+    Converts HTML into a standard Draft JS JSON format in an executor,
+    without blocking the event loop.
+
+    If the coroutine is cancelled, a conversion running in a thread stops
+    after the block being converted, a conversion waiting for a process
+    is not started.
+
+    :param html:
+    :type html: Union[str, bytes]
+
+    :param features: The features for the HTML tree-builder.
+    :type features: str
+
+    :param strict: Whether unsupported tags or structures should raise an error.
+    :type strict: bool
+
+    :param executor: The thread or process executor running the conversion,
+        the default executor of the event loop if not set.
+    :type executor: Optional[concurrent.futures.Executor]
+
+    :param semaphore: Limits the number of conversions running at once, the
+        others waiting for their turn. Defaults to a semaphore per event loop
+        allowing ``DEFAULT_CONCURRENCY`` conversions.
+    :type semaphore: Optional[asyncio.Semaphore]
+
+    :rtype: dict
+    """
+    loop = asyncio.get_event_loop()
+
+    if semaphore is None:
+        semaphore = _get_default_semaphore(loop)
+
+    # The processes cannot share the cancellation with the event loop
+    if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+        cancelled = None
+        convert = functools.partial(_convert_in_process, html, features, strict)
+    else:
+        cancelled = threading.Event()
+        convert = functools.partial(_convert, html, features, strict, cancelled)
+
+    async with semaphore:
+        future = loop.run_in_executor(executor, convert)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if cancelled is not None:
+                cancelled.set()
+            raise
+
+
+class _AsyncConversions(object):
+    """
+    The results of :func:`html_to_draftjs_many_async`, an asynchronous iterator
+    rather than an asynchronous generator so that it runs on Python 3.5.
+    """
+
+    def __init__(self, documents, features, strict, executor, concurrency, ordered):
+        if hasattr(documents, "__aiter__"):
+            self._documents = documents.__aiter__()
+            self._read = self._read_async
+        else:
+            self._documents = iter(documents)
+            self._read = self._read_sync
+
+        self.features = features
+        self.strict = strict
+        self.executor = executor
+        self.concurrency = concurrency
+        self.ordered = ordered
+
+        # The conversions being run, in the order of their documents
+        self.pending = collections.deque()  # type: collections.deque
+        self.index = 0
+
+        # Whether the documents were all read, or the iterator closed
+        self.exhausted = False
+
+        # The semaphore is never waited for, the conversions being bounded by the
+        # batch. It is created once iterating, in the event loop running it.
+        self.semaphore = None
+
+    async def _read_async(self):
+        try:
+            return await self._documents.__anext__()
+        except StopAsyncIteration:
+            return _END
+
+    async def _read_sync(self):
+        return next(self._documents, _END)
+
+    async def _convert(self, index, html):
+        try:
+            result = await html_to_draftjs_async(
+                html, self.features, self.strict, self.executor, self.semaphore
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            return ConversionResult(index, None, exc)
+        return ConversionResult(index, result, None)
+
+    def _pop_done(self):
+        """
+        :return: The next completed conversion to yield, None if there is none.
+        :rtype: Optional[asyncio.Future]
+        """
+        if self.ordered:
+            if self.pending[0].done():
+                return self.pending.popleft()
+            return None
+
+        for task in self.pending:
+            if task.done():
+                self.pending.remove(task)
+                return task
+
+        return None
+
+    async def _start_conversions(self, running):
+        """
+        Reads the next documents until ``concurrency`` conversions are running,
+        without buffering more than ``concurrency`` completed results waiting
+        for a slower conversion of a previous document.
+        """
+        while (
+            not self.exhausted
+            and running < self.concurrency
+            and len(self.pending) < self.concurrency * 2
+        ):
+            html = await self._read()
+            if html is _END:
+                self.exhausted = True
+                return
+
+            task = asyncio.ensure_future(self._convert(self.index, html))
+            self.pending.append(task)
+            self.index += 1
+            running += 1
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+
+        try:
+            while True:
+                running = [task for task in self.pending if not task.done()]
+                await self._start_conversions(len(running))
+
+                if not self.pending:
+                    raise StopAsyncIteration
+
+                task = self._pop_done()
+                if task is not None:
+                    return task.result()
+
+                # Keep converting the next documents while waiting for the result
+                running = [task for task in self.pending if not task.done()]
+                await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            await self.aclose()
+            raise
+
+    async def aclose(self):
+        """Cancels the pending conversions, no more documents being read."""
+        self.exhausted = True
+
+        while self.pending:
+            self.pending.pop().cancel()
+
+
+def html_to_draftjs_many_async(
+    documents,
+    features="lxml",
+    strict=False,
+    executor=None,
+    concurrency=DEFAULT_CONCURRENCY,
+    ordered=True,
+):
+    """
+    Converts many HTML documents in an executor, without blocking the event loop.
+
+    The documents are consumed lazily: no more than ``concurrency`` documents
+    are converted at once, the next ones being read as conversions complete.
+    In order, up to ``concurrency`` results are kept while waiting for the
+    result of a slower document.
+    An error raised by a document is captured into its result instead of
+    aborting the whole batch. Closing the iterator cancels the pending conversions.
+
+    :param documents: The HTML documents to convert.
+    :type documents: Union[Iterable[str], AsyncIterable[str]]
+
+    :param features: The features for the HTML tree-builder.
+    :type features: str
+
+    :param strict: Whether unsupported tags or structures should raise an error.
+    :type strict: bool
+
+    :param executor: The thread or process executor running the conversions,
+        the default executor of the event loop if not set.
+    :type executor: Optional[concurrent.futures.Executor]
+
+    :param concurrency: The maximum number of conversions running at once.
+    :type concurrency: int
+
+    :param ordered: Whether the results should be yielded in the order of
+        the documents, otherwise they are yielded as soon as they are converted.
+    :type ordered: bool
+
+    :return: The results, carrying the index of their document.
+    :rtype: AsyncIterator[ConversionResult]
+    """
+    return _AsyncConversions(
+        documents, features, strict, executor, concurrency, ordered
+    )
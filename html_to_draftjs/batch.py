@@ -0,0 +1,133 @@
+import functools
+from collections import namedtuple
+
+__all__ = ["ConversionResult", "html_to_draftjs_many"]
+
+# The outcome of the conversion of a document of a batch.
+# Either ``result`` is the Draft JS data or ``error`` is the raised exception.
+ConversionResult = namedtuple("ConversionResult", ["index", "result", "error"])
+
+# The number of chunks submitted in advance to every worker
+PREFETCH_CHUNKS = 4
+
+
+def _portable_error(exc):
+    """
+    Returns a copy of an exception that can be sent back from a worker process:
+    its arguments, such as the bs4 tags, are replaced by their representation.
+    """
+    args = tuple(
+        arg if isinstance(arg, (str, int, float, type(None))) else repr(arg)
+        for arg in exc.args
+    )
+
+    try:
+        return type(exc)(*args)
+    except Exception:
+        return RuntimeError(repr(exc))
+
+
+def _initialize_worker(options):
+    """Imports the parser and warms up the converters once per worker process."""
+    from html_to_draftjs import html_to_draftjs
+
+    html_to_draftjs("", **options)
+
+
+def _convert(options, task):
+    from html_to_draftjs import html_to_draftjs
+
+    index, html = task
+
+    try:
+        result = html_to_draftjs(html, **options)
+    except Exception as exc:
+        return ConversionResult(index, None, _portable_error(exc))
+
+    return ConversionResult(index, result, None)
+
+
+def _throttle(tasks, semaphore, closed):
+    """
+    Yields the tasks to the pool as their results are consumed, the semaphore
+    being released for every consumed result, until the batch is closed.
+    """
+    while True:
+        semaphore.acquire()
+        if closed.is_set():
+            return
+
+        task = next(tasks, None)
+        if task is None:
+            return
+        yield task
+
+
+def html_to_draftjs_many(
+    documents,
+    workers=None,
+    chunksize=16,
+    ordered=True,
+    features="lxml",
+    strict=False,
+):
+    """
+    Converts many HTML documents using a pool of worker processes.
+
+    The documents are consumed lazily: only a few chunks per worker are
+    submitted in advance, the next ones being submitted as the results are
+    consumed so that the workers never wait for each other. An error raised by
+    a document is captured into its result instead of aborting the whole batch.
+
+    :param documents: The HTML documents to convert.
+    :type documents: Iterable[str]
+
+    :param workers: The number of worker processes, defaults to the number of CPUs.
+        If zero, the documents are converted in the current process.
+    :type workers: Optional[int]
+
+    :param chunksize: The number of documents sent at once to a worker.
+    :type chunksize: int
+
+    :param ordered: Whether the results should be yielded in the order of
+        the documents, otherwise they are yielded as soon as they are converted.
+    :type ordered: bool
+
+    :param features: The features for the HTML tree-builder.
+    :type features: str
+
+    :param strict: Whether unsupported tags or structures should raise an error.
+    :type strict: bool
+
+    :return: The results, carrying the index of their document.
+    :rtype: Iterator[ConversionResult]
+    """
+    options = {"features": features, "strict": strict}
+    convert = functools.partial(_convert, options)
+    tasks = enumerate(documents)
+
+    if workers == 0:
+        yield from map(convert, tasks)
+        return
+
+    import multiprocessing
+    import threading
+
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+
+    semaphore = threading.Semaphore(workers * chunksize * PREFETCH_CHUNKS)
+    closed = threading.Event()
+
+    with multiprocessing.Pool(workers, _initialize_worker, (options,)) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+
+        try:
+            for result in imap(convert, _throttle(tasks, semaphore, closed), chunksize):
+                yield result
+                semaphore.release()
+        finally:
+            # Wakes the pool up if it is waiting for a result to be consumed,
+            # so that it can be terminated
+            closed.set()
+            semaphore.release()
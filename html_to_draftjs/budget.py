@@ -0,0 +1,71 @@
+__all__ = ["Budget"]
+
+# The number of nodes visited between two checks of the deadline
+DEADLINE_CHECK_INTERVAL = 256
+
+
+class Budget(object):
+    """
+    Limits the resources used by conversions, unlimited by default.
+
+    Once a budget is exceeded, the strict conversions raise
+    a :class:`html_to_draftjs.exceptions.BudgetExceededError`, the other ones
+    dispatch an error and stop, returning the blocks converted so far.
+    The elements deeper than ``max_depth`` are skipped instead.
+
+    :param max_bytes: The maximum length of the HTML (in characters when passed
+        as a string), the HTML is truncated to that length in non-strict mode.
+    :type max_bytes: Optional[int]
+
+    :param max_nodes: The maximum number of visited nodes (tags and strings).
+    :type max_nodes: Optional[int]
+
+    :param max_blocks: The maximum number of block elements.
+    :type max_blocks: Optional[int]
+
+    :param max_entities: The maximum number of entities.
+    :type max_entities: Optional[int]
+
+    :param max_depth: The maximum nesting depth of the elements, see the
+        ``max_depth`` option of the converters.
+    :type max_depth: Optional[int]
+
+    :param timeout: The maximum duration of a conversion from its start,
+        in seconds. It is checked while walking the elements, thus the parsing
+        is never interrupted.
+    :type timeout: Optional[float]
+    """
+
+    __slots__ = (
+        "max_bytes",
+        "max_nodes",
+        "max_blocks",
+        "max_entities",
+        "max_depth",
+        "timeout",
+    )
+
+    def __init__(
+        self,
+        max_bytes=None,
+        max_nodes=None,
+        max_blocks=None,
+        max_entities=None,
+        max_depth=None,
+        timeout=None,
+    ):
+        self.max_bytes = max_bytes
+        self.max_nodes = max_nodes
+        self.max_blocks = max_blocks
+        self.max_entities = max_entities
+        self.max_depth = max_depth
+        self.timeout = timeout
+
+    def __repr__(self):
+        return "Budget({})".format(
+            ", ".join(
+                "{}={!r}".format(name, getattr(self, name))
+                for name in self.__slots__
+                if getattr(self, name) is not None
+            )
+        )
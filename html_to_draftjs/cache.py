@@ -0,0 +1,326 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+
+__all__ = ["ConversionCache", "MemoryBackend", "DiskBackend", "converter_fingerprint"]
+
+# The share of the ``max_entries`` of a disk backend removed at once when it is
+# full, its directory being scanned again once as many results were written
+EVICTION_SHARE = 0.1
+
+# The fingerprints of the converters, computed once per converter
+_FINGERPRINTS = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+
+
+def _canonical(value):
+    """
+    Returns a stable representation of a piece of configuration of a converter:
+    the mappings are sorted and the callables are identified by their name.
+    """
+    if isinstance(value, dict):
+        return "{%s}" % ",".join(
+            "{}:{}".format(_canonical(key), _canonical(value[key]))
+            for key in sorted(value, key=repr)
+        )
+
+    if isinstance(value, (list, tuple)):
+        return "%s(%s)" % (type(value).__name__, ",".join(map(_canonical, value)))
+
+    if callable(value):
+        return "{}.{}".format(
+            getattr(value, "__module__", ""), getattr(value, "__qualname__", "")
+        )
+
+    return repr(value)
+
+
+def converter_fingerprint(converter):
+    """
+    Computes a fingerprint of the configuration of a converter, such as
+    two converters producing the same output share the same fingerprint.
+
+    :param converter:
+    :type converter: SoupConverter
+
+    :rtype: str
+    """
+    try:
+        return _FINGERPRINTS[converter]
+    except KeyError:
+        pass
+
+    configuration = _canonical(
+        (
+            type(converter),
+            converter.key_generator,
+            converter.inlines_types,
+            converter.blocks_types,
+            converter.typed_blocks_types,
+            converter.entities_types,
+            converter.text_tags,
+            converter.default_block_tag_name,
+            converter.max_depth,
+            converter.dedupe_entities,
+            converter.budget,
+        )
+    )
+    fingerprint = hashlib.sha256(configuration.encode("utf-8")).hexdigest()
+    _FINGERPRINTS[converter] = fingerprint
+    return fingerprint
+
+
+class MemoryBackend(object):
+    """
+    Stores the serialized results in memory, evicting the least recently used
+    ones once there are more than ``max_entries`` or they take more than
+    ``max_bytes`` (approximately, based on the length of their JSON).
+
+    :param max_entries: The maximum number of results, unlimited if None.
+    :type max_entries: Optional[int]
+
+    :param max_bytes: The maximum size of the results, unlimited if None.
+    :type max_bytes: Optional[int]
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()  # type: OrderedDict
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+
+            self._entries[key] = value
+            self.size += len(value)
+
+            while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries)
+                or (self.max_bytes is not None and self.size > self.max_bytes)
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class DiskBackend(object):
+    """
+    Stores the serialized results as files of a directory, allowing to share them
+    between processes. The files are written atomically.
+
+    Once there are more than ``max_entries`` results, the least recently used
+    ones (by modification time, which is refreshed on every hit) are removed,
+    down to ``EVICTION_SHARE`` below ``max_entries``.
+
+    The results are counted by scanning the directory once, then as they are
+    written, the directory being scanned again every ``EVICTION_SHARE`` of
+    ``max_entries`` writes to count the results written by other processes.
+
+    :param directory: The directory of the results, created if missing.
+    :type directory: str
+
+    :param max_entries: The maximum number of results, unlimited if None.
+    :type max_entries: Optional[int]
+    """
+
+    def __init__(self, directory, max_entries=None):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+
+        # The number of results, None until the directory is scanned
+        self._count = None
+
+        # The number of results written since the directory was last scanned
+        self._writes = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def _list(self):
+        return [
+            entry
+            for entry in os.scandir(self.directory)
+            if entry.is_file() and entry.name.endswith(".json")
+        ]
+
+    def _scan(self):
+        entries = self._list()
+        self._count = len(entries)
+        self._writes = 0
+        return entries
+
+    def __len__(self):
+        with self._lock:
+            if self._count is None:
+                self._scan()
+            return self._count
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as fp:
+                value = fp.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return value
+
+    def set(self, key, value):
+        path = self._path(key)
+        exists = os.path.exists(path)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fp:
+                fp.write(value)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            self._writes += 1
+            if self._count is not None and not exists:
+                self._count += 1
+
+            if self.max_entries is not None:
+                self._evict()
+
+    def _evict(self):
+        """Removes the least recently used results once there are too many."""
+        margin = int(self.max_entries * EVICTION_SHARE)
+
+        if (
+            self._count is not None
+            and self._count <= self.max_entries
+            and self._writes < max(margin, 1)
+        ):
+            return
+
+        entries = self._scan()
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[: len(entries) - self.max_entries + margin]:
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+            self._count -= 1
+
+    def clear(self):
+        with self._lock:
+            for entry in self._list():
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+            self._count = 0
+            self._writes = 0
+
+
+class ConversionCache(object):
+    """
+    Caches the results of conversions, keyed by a hash of the HTML, the parser,
+    the strict mode and the configuration of the converter.
+
+    The results are stored serialized: every hit returns a new copy of the result,
+    which can be freely modified by the caller.
+
+    :param backend: Where the results are stored, defaults to a
+        :class:`MemoryBackend` of 1024 results.
+    :type backend: Optional[Union[MemoryBackend, DiskBackend]]
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(html, features, strict, converter, selector=None):
+        """
+        :param html:
+        :type html: Union[str, bytes]
+
+        :param features: The features for the HTML tree-builder.
+        :type features: str
+
+        :param strict:
+        :type strict: bool
+
+        :param converter: The converter of the HTML.
+        :type converter: SoupConverter
+
+        :param selector: The CSS selector of the converted element, if any.
+        :type selector: Optional[str]
+
+        :rtype: str
+        """
+        if isinstance(html, str):
+            html = html.encode("utf-8", "surrogatepass")
+
+        digest = hashlib.sha256()
+        digest.update(
+            "{}\0{}\0{}\0".format(
+                converter_fingerprint(converter), features, bool(strict)
+            ).encode("utf-8")
+        )
+        if selector is not None:
+            digest.update("selector\0{}\0".format(selector).encode("utf-8"))
+        digest.update(html)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        :return: A copy of the cached result, None if not cached.
+        :rtype: Optional[dict]
+        """
+        value = self.backend.get(key)
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, key, result):
+        self.backend.set(key, json.dumps(result, separators=(",", ":")))
+
+    def clear(self):
+        self.backend.clear()
+        self.hits = self.misses = 0
+
+    def stats(self):
+        """
+        :return: The number of hits and misses, and of cached results.
+        :rtype: dict
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.backend)}
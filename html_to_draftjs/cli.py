@@ -0,0 +1,248 @@
+"""
+Converts HTML documents into Draft JS JSON, written as newline-delimited JSON.
+
+The documents are read from files and directories, or from newline-delimited
+JSON records on the standard input (``{"id": ..., "html": "..."}`` objects
+or plain strings). Every document is written as a ``{"id": ..., "result": {...}}``
+record, or a ``{"id": ..., "error": {...}}`` record if it failed, in the order
+of the input.
+"""
+
+import argparse
+import collections
+import fnmatch
+import json
+import os
+import sys
+import time
+
+from html_to_draftjs.batch import html_to_draftjs_many
+from html_to_draftjs.files import decode_html, open_html_bytes
+
+__all__ = ["main"]
+
+# The files converted by default when a directory is passed
+DEFAULT_PATTERNS = ("*.html", "*.htm")
+
+FEATURES = ("lxml", "html.parser", "html5lib")
+
+
+class _Input(object):
+    """A document to convert, along with its identifier in the output."""
+
+    __slots__ = ("id", "html", "size", "error")
+
+    def __init__(self, id, html="", size=0, error=None):
+        self.id = id
+        self.html = html
+        self.size = size
+
+        # The error raised while reading the document, if any
+        self.error = error
+
+
+def _iter_paths(paths, patterns):
+    """Yields the files, and the files of the directories matching the patterns."""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for directory, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if any(fnmatch.fnmatch(filename, pattern) for pattern in patterns):
+                    yield os.path.join(directory, filename)
+
+
+def _read_file(path):
+    try:
+        with open_html_bytes(path) as data:
+            return _Input(path, decode_html(data), len(data))
+    except OSError as exc:
+        return _Input(path, error=exc)
+
+
+def _read_record(number, line):
+    try:
+        record = json.loads(line)
+    except ValueError as exc:
+        return _Input(number, size=len(line), error=exc)
+
+    if isinstance(record, str):
+        return _Input(number, record, len(line))
+
+    if not isinstance(record, dict):
+        record = {}
+
+    id = record.get("id", number)
+    if not isinstance(record.get("html"), str):
+        error = ValueError("Expected a string or an object with a html string")
+        return _Input(id, size=len(line), error=error)
+
+    return _Input(id, record["html"], len(line))
+
+
+def iter_inputs(paths, patterns=DEFAULT_PATTERNS, stdin=None):
+    """
+    Reads the documents lazily, one at a time.
+
+    :param paths: The files and directories to convert, ``-`` being
+        the standard input.
+    :type paths: List[str]
+
+    :param patterns: The glob patterns of the files of the directories to convert.
+    :type patterns: Iterable[str]
+
+    :param stdin: The newline-delimited JSON records read when no path is given.
+    :type stdin: Optional[TextIO]
+
+    :rtype: Iterator[_Input]
+    """
+    if not paths or paths == ["-"]:
+        stdin = sys.stdin if stdin is None else stdin
+        for number, line in enumerate(stdin, 1):
+            if line.strip():
+                yield _read_record(number, line)
+        return
+
+    for path in _iter_paths(paths, patterns):
+        yield _read_file(path)
+
+
+def _format_error(exc):
+    return {"type": type(exc).__name__, "message": str(exc)}
+
+
+def convert(inputs, output, features="lxml", strict=False, workers=None, chunksize=16):
+    """
+    Converts the documents using :func:`html_to_draftjs.html_to_draftjs_many`,
+    only reading a few batches ahead, and writes their record as they complete.
+
+    :param inputs: The documents to convert.
+    :type inputs: Iterable[_Input]
+
+    :param output: The file the records are written to.
+    :type output: TextIO
+
+    :return: The number of converted documents, of errors and of bytes read.
+    :rtype: Tuple[int, int, int]
+    """
+    # The documents being converted, in the order of their results
+    pending = collections.deque()  # type: collections.deque
+
+    def documents():
+        for document in inputs:
+            pending.append(document)
+            yield document.html
+
+    total = errors = size = 0
+    results = html_to_draftjs_many(
+        documents(), workers, chunksize, features=features, strict=strict
+    )
+
+    for result in results:
+        document = pending.popleft()
+        error = document.error or result.error
+
+        if error is None:
+            record = {"id": document.id, "result": result.result}
+        else:
+            record = {"id": document.id, "error": _format_error(error)}
+            errors += 1
+
+        output.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        output.write("\n")
+
+        total += 1
+        size += document.size
+
+    return total, errors, size
+
+
+def create_parser():
+    parser = argparse.ArgumentParser(
+        prog="html-to-draftjs", description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        metavar="PATH",
+        help="The files and directories to convert, "
+        "newline-delimited JSON records are read from stdin if not set (or -)",
+    )
+    parser.add_argument(
+        "-f",
+        "--features",
+        choices=FEATURES,
+        default="lxml",
+        help="The parser to use (default: lxml)",
+    )
+    parser.add_argument(
+        "-s",
+        "--strict",
+        action="store_true",
+        help="Fail the documents with unsupported tags or structures",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        help="The number of worker processes (default: the number of CPUs), "
+        "0 to convert in the current process",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=16,
+        help="The number of documents sent at once to a worker (default: 16)",
+    )
+    parser.add_argument(
+        "-p",
+        "--pattern",
+        action="append",
+        dest="patterns",
+        help="The glob pattern of the files of the directories to convert, "
+        "can be repeated (default: *.html and *.htm)",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Don't print the summary"
+    )
+    return parser
+
+
+def main(argv=None):
+    """
+    Runs the command line, see ``html-to-draftjs --help``.
+
+    :return: The exit status, 1 if a document failed.
+    :rtype: int
+    """
+    args = create_parser().parse_args(argv)
+
+    start = time.perf_counter()
+    total, errors, size = convert(
+        iter_inputs(args.paths, args.patterns or DEFAULT_PATTERNS),
+        sys.stdout,
+        args.features,
+        args.strict,
+        args.workers,
+        args.chunksize,
+    )
+    elapsed = time.perf_counter() - start
+
+    if not args.quiet:
+        print(
+            "{} documents ({} errors), {:.2f} MB in {:.2f}s "
+            "({:.1f} documents/s, {:.2f} MB/s)".format(
+                total,
+                errors,
+                size / 1e6,
+                elapsed,
+                total / elapsed if elapsed else 0,
+                size / 1e6 / elapsed if elapsed else 0,
+            ),
+            file=sys.stderr,
+        )
+
+    return 1 if errors else 0
@@ -1,12 +1,247 @@
+import copy
+import time
 import warnings
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+from html_to_draftjs import serialization, types
+from html_to_draftjs.budget import DEADLINE_CHECK_INTERVAL, Budget  # noqa
+from html_to_draftjs.diagnostics import Diagnostics  # noqa
+from html_to_draftjs.exceptions import BudgetExceededError
+from html_to_draftjs.instrumentation import Instrumentation  # noqa
+from html_to_draftjs.model import Block, register_style
+
+# beautifulsoup4 is only imported by the callers building a soup
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from bs4.element import Tag
+
+__all__ = ["SoupConverter", "TextBuilder"]
+
+# The kinds of tags, as resolved by the dispatch table of the converters
+BLOCK_TAG, ENTITY_TAG, TEXT_TAG, INLINE_TAG = range(4)
+
+# The maximum number of nested block elements being recorded at once
+# by the converters memoizing the blocks, the deeper ones are not recorded
+MAX_RECORDING_DEPTH = 16
+
+
+class _BudgetExhausted(Exception):
+    """Stops a non-strict conversion which exceeded one of its budgets."""
+
+
+class _BlockRecord(object):
+    """
+    The output of the conversion of a block element, including its nested blocks,
+    recorded to be replayed for the identical elements of the document.
+
+    The blocks are stored in the order they were finished, along with their
+    position relative to the recorded element. The entities are stored along
+    with the key they were given when recorded.
+    """
+
+    __slots__ = (
+        "element",
+        "key",
+        "block_start",
+        "blocks",
+        "entities",
+        "order",
+        "replayable",
+    )
+
+    def __init__(self, element, key, block_start):
+        self.element = element
+        self.key = key
+        self.block_start = block_start
+        self.blocks = []
+        self.entities = []
+
+        # The indexes of the blocks, in the order their element was opened
+        self.order = None
+
+        # Whether the conversion was free of errors, otherwise the errors
+        # would not be dispatched again when replaying it
+        self.replayable = True
+
+    def finalize(self):
+        """Stops recording the element and prepares the record to be replayed."""
+        self.element = None
+        blocks = self.blocks
+        self.order = sorted(range(len(blocks)), key=lambda i: blocks[i][0])
+
+
+class _BlockMemo(object):
+    """
+    The recorded block elements of a conversion, by structure.
+
+    Identifying the structure of an element requires to go through all
+    its descendants, thus it is only done for the elements sharing a cheap
+    signature with a previous element. Then, an element is recorded once
+    its structure was seen before, and replayed afterwards.
+    """
+
+    __slots__ = (
+        "records",
+        "seen",
+        "signatures",
+        "structure_ids",
+        "interned",
+        "nodes",
+    )
+
+    # The replayed blocks are given new keys
+    keep_keys = False
+
+    def __init__(self):
+        self.records = {}
+        self.seen = set()
+
+        # The first element of every signature, None once its structure is known
+        self.signatures = {}
+
+        # The identifier of the structure of the tags, by ``id()`` of the tag
+        self.structure_ids = {}
+        self.interned = {}
+
+        # The tags identified by their ``id()``, kept alive for the identifiers
+        # not to be reused: the lxml elements are proxies created on access
+        self.nodes = []
+
+    def get_key(self, node, parent, depth):
+        """
+        :return: The key of a block element, None if no element of the same
+            signature was met before.
+        :rtype: Optional[tuple]
+        """
+        contents = node.contents
+        first = contents[0] if contents else None
+        signature = (
+            parent.name,
+            depth,
+            node.name,
+            len(contents),
+            first if isinstance(first, str) else None,
+        )
+
+        first_node = self.signatures.get(signature, node)
+        if first_node is node:
+            self.signatures[signature] = node
+            self.nodes.append(node)
+            return None
+
+        if first_node is not None:
+            self.signatures[signature] = None
+            self.seen.add((parent.name, depth, self.get_structure_id(first_node)))
+
+        return parent.name, depth, self.get_structure_id(node)
+
+    def get_record(self, key):
+        """
+        :return: The record to replay for a block element, None if not recorded.
+        :rtype: Optional[_BlockRecord]
+        """
+        return self.records.get(key)
+
+    def should_record(self, key):
+        """
+        :return: Whether a block element should be recorded,
+            once its structure was seen before.
+        :rtype: bool
+        """
+        if key in self.seen:
+            return True
+
+        if key is not None:
+            self.seen.add(key)
+
+        return False
+
+    def add_record(self, record):
+        self.records[record.key] = record
+
+    def get_structure_id(self, root):
+        """
+        Identifies the structure of a tag: the tags having the same name,
+        attributes and contents share the same identifier.
+
+        :param root:
+        :type root: Tag
+
+        :rtype: int
+        """
+        structure_ids = self.structure_ids
+        interned = self.interned
+
+        structure_id = structure_ids.get(id(root))
+        if structure_id is not None:
+            return structure_id
+
+        # The tags being processed: their remaining children, the tag
+        # and the structure of its processed children
+        stack = [(iter(root.contents), root, [])]
+
+        while stack:
+            children, element, parts = stack[-1]
+
+            for node in children:
+                if isinstance(node, str):
+                    parts.append(node)
+                    continue
+
+                structure_id = structure_ids.get(id(node))
+                if structure_id is not None:
+                    parts.append(structure_id)
+                    continue
+
+                stack.append((iter(node.contents), node, []))
+                break
+            else:
+                stack.pop()
 
-from bs4 import BeautifulSoup
-from bs4.element import Tag
+                attrs = element.attrs
+                structure = (element.name, repr(attrs) if attrs else "", tuple(parts))
+                structure_id = interned.setdefault(structure, len(interned))
+                structure_ids[id(element)] = structure_id
+                self.nodes.append(element)
 
-from html_to_draftjs import types
+                if stack:
+                    stack[-1][2].append(structure_id)
 
-__all__ = ["SoupConverter"]
+        return structure_id
+
+
+class TextBuilder(object):
+    """
+    Accumulates the text chunks of a block being built and keeps track
+    of its length, the chunks are only joined once the block is finished.
+    """
+
+    __slots__ = ("_chunks", "_length")
+
+    def __init__(self):
+        self._chunks = []
+        self._length = 0
+
+    def append(self, text):
+        """
+        :param text: The text to append to the block.
+        :type text: str
+        """
+        if text:
+            self._chunks.append(text)
+            self._length += len(text)
+
+    def __iadd__(self, text):
+        self.append(text)
+        return self
+
+    def __len__(self):
+        return self._length
+
+    def __str__(self):
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
 
 
 class SoupConverter(object):
@@ -20,16 +255,24 @@ class SoupConverter(object):
         entities=types.ENTITIES,
         text_tags=types.TEXT_TAGS,
         default_block_tag_name=None,
+        max_depth=None,
+        memoize_blocks=False,
+        dedupe_entities=False,
+        budget=None,
     ):
         """
         Handles a HTML soup (beautifulsoup4) to convert it to Draft JS's JSON format.
 
+        The converter can be reused and shared between threads, every conversion
+        happens in its own session (see :meth:`new_session`).
+
         :param strict: Whether unsupported tags or structures should raise an error.
         :type strict: bool
 
         :param key_generator:
             The key generator. Called every time a block key must be generated,
-            it takes the generated DraftJS block dictionary as parameter.
+            it takes the generated block as parameter, which can be read
+            as a DraftJS block dictionary (see :class:`Block`).
             By default, it returns an empty key (no key), which is valid for DraftJS.
         :type key_generator: Callable[Dict[str, Any]]
 
@@ -51,6 +294,24 @@ class SoupConverter(object):
         :param default_block_tag_name: The tag for blocks to wrap invalid HTML structure
             that has inline tags as root element.
         :type default_block_tag_name: str
+
+        :param max_depth: The maximum nesting depth of the elements to convert,
+            deeper elements are skipped (or raise an error in strict mode).
+            Unlimited by default.
+        :type max_depth: Optional[int]
+
+        :param memoize_blocks: Whether the conversion of the block elements should be
+            reused for the identical block elements of a same document, instead of
+            converting them again. Worth it for documents repeating the same blocks.
+        :type memoize_blocks: bool
+
+        :param dedupe_entities: Whether the identical entities (same type,
+            mutability and data) should share the same key, instead of adding
+            a new entity to the entity map for each of them.
+        :type dedupe_entities: bool
+
+        :param budget: The default budget of the conversions, see :class:`Budget`.
+        :type budget: Optional[Budget]
         """
 
         self.strict = strict
@@ -62,6 +323,10 @@ class SoupConverter(object):
         self.entities_types = entities
         self.text_tags = text_tags
         self.default_block_tag_name = default_block_tag_name or self.blocks_types[0]
+        self.max_depth = max_depth
+        self.memoize_blocks = memoize_blocks
+        self.dedupe_entities = dedupe_entities
+        self.budget = budget
 
         # Contains all the tags that are inline
         self._all_inline_tags = set()
@@ -69,27 +334,78 @@ class SoupConverter(object):
         self._all_inline_tags.update(self.entities_types.keys())
         self._all_inline_tags.update(self.text_tags.keys())
 
-        # -- The generated entity map for DraftJS
+        # The identifier of the style of every inline tag
+        self._style_ids = {
+            tag_name: register_style(style)
+            for tag_name, style in self.inlines_types.items()
+        }
+
+        # The kind of every supported tag, resolved by order of precedence
+        self._tag_kinds = {}
+        self._tag_kinds.update(dict.fromkeys(self.inlines_types, INLINE_TAG))
+        self._tag_kinds.update(dict.fromkeys(self.text_tags, TEXT_TAG))
+        self._tag_kinds.update(dict.fromkeys(self.entities_types, ENTITY_TAG))
+        self._tag_kinds.update(dict.fromkeys(self.typed_blocks_types, BLOCK_TAG))
+        self._tag_kinds.update(dict.fromkeys(self.blocks_types, BLOCK_TAG))
+
+        # The type of the typed blocks, by (tag, parent tag) for the types
+        # depending on the parent, and by (tag, None) for the others
+        self._typed_block_types = {}
+        for tag_name, definitions in self.typed_blocks_types.items():
+            if isinstance(definitions, str):
+                self._typed_block_types[tag_name, None] = definitions
+                continue
+
+            for spec in definitions:  # type: dict
+                self._typed_block_types.setdefault(
+                    (tag_name, spec["parent"]), spec["type"]
+                )
+
+        # -- The state of a conversion, only set on the sessions (see ``new_session``)
         # The cursor for types
         self._entity_cursor = None  # type: Optional[int]
 
         # the defined types (images, links, etc.)
         self._entities = None  # type: Optional[dict]
 
+        # the keys of the defined types by content, if ``dedupe_entities`` is set
+        self._entity_keys = None  # type: Optional[dict]
+
         # the defined blocks (p, div, etc.)
         self._blocks = None  # type: Optional[list]
 
+        # the positions of the blocks being built in ``_blocks``
+        self._open_block_indexes = None  # type: Optional[list]
+
+        # the blocks finished but not yet yielded by ``iter_blocks``
+        self._finished_blocks = None  # type: Optional[list]
+
+        # the recorder of the timings and counters, if enabled
+        self._instrumentation = None  # type: Optional[Instrumentation]
+
+        # the collector of the errors, warnings are generated if not set
+        self._diagnostics = None  # type: Optional[Diagnostics]
+
+        # the recorded block elements, if ``memoize_blocks`` is set
+        self._memo = None  # type: Optional[_BlockMemo]
+
+        # the block elements being recorded, from the outermost to the innermost
+        self._recordings = None  # type: Optional[list]
+
+        # the budget of the conversion, if any
+        self._budget = None  # type: Optional[Budget]
+
+        # the time at which the conversion must stop, if any
+        self._deadline = None  # type: Optional[float]
+
+        # the number of visited nodes and opened block elements,
+        # only counted if there is a budget
+        self._visited_nodes = None  # type: Optional[int]
+        self._opened_blocks = None  # type: Optional[int]
+
     @staticmethod
     def create_default_block():
-        return {
-            "key": "",
-            "text": "",
-            "type": "unstyled",
-            "depth": 0,
-            "inlineStyleRanges": [],
-            "entityRanges": [],
-            "data": {},
-        }
+        return Block()
 
     def append_entity(self, entity):
         """
@@ -101,71 +417,412 @@ class SoupConverter(object):
         :return: The key of the entity,
         :rtype: str
         """
-        key = self._entity_cursor
-        self._entity_cursor += 1
-        self._entities[str(key)] = entity
+        key = None
+        content = None
+
+        # Reuse the key of an identical entity
+        if self._entity_keys is not None:
+            content = self.get_entity_content(entity)
+            key = self._entity_keys.get(content)
+
+        if key is None:
+            budget = self._budget
+            if (
+                budget is not None
+                and budget.max_entities is not None
+                and self._entity_cursor >= budget.max_entities
+            ):
+                self.exceed_budget("max_entities", budget.max_entities)
+
+            key = self._entity_cursor
+            self._entity_cursor += 1
+            self._entities[str(key)] = entity
+
+            if content is not None:
+                self._entity_keys[content] = key
+
+            if self._instrumentation is not None:
+                self._instrumentation.incr("entities")
+
+        if self._recordings:
+            entity = dict(entity, data=dict(entity["data"]))
+            for record in self._recordings:
+                record.entities.append((key, entity))
+
         return key
 
+    @staticmethod
+    def get_entity_content(entity):
+        """
+        :return: The content identifying an entity,
+            None if its data cannot be compared.
+        :rtype: Optional[tuple]
+        """
+        content = (
+            entity["type"],
+            entity["mutability"],
+            tuple(sorted(entity["data"].items())),
+        )
+
+        try:
+            hash(content)
+        except TypeError:
+            return None
+
+        return content
+
     def append_block(self, block_data):
-        self._blocks.append(block_data)
+        # Finished blocks are handed over to the caller in incremental sessions,
+        # thus they are not stored.
+        if self._finished_blocks is None:
+            self._blocks.append(block_data)
 
-    def initialize_session_converter(self):
-        """Initialize the session to zero."""
+    def new_session(
+        self, incremental=False, instrumentation=None, diagnostics=None, budget=None
+    ):
+        """
+        Creates a session holding the state of a single conversion.
+
+        The session is a shallow copy of the converter: it shares the configuration
+        of the converter and stores the blocks and entities being converted.
+        The converter itself is thus never modified by the conversions,
+        allowing to share it between threads.
+
+        :param incremental: See :meth:`initialize_session_converter`.
+        :type incremental: bool
+
+        :param instrumentation: Records the timings and counters of the conversion.
+        :type instrumentation: Optional[Instrumentation]
+
+        :param diagnostics: Collects the errors instead of generating warnings.
+        :type diagnostics: Optional[Diagnostics]
+
+        :param budget: Limits the resources used by the conversion,
+            defaults to the budget of the converter.
+        :type budget: Optional[Budget]
+
+        :return: The new session.
+        :rtype: SoupConverter
+        """
+        session = copy.copy(self)
+        session.initialize_session_converter(incremental)
+        session._instrumentation = instrumentation
+        session._diagnostics = diagnostics
+
+        budget = budget if budget is not None else self.budget
+        if budget is not None:
+            session._budget = budget
+            session._visited_nodes = 0
+            session._opened_blocks = 0
+
+            if budget.timeout is not None:
+                session._deadline = time.monotonic() + budget.timeout
+            if budget.max_depth is not None and (
+                self.max_depth is None or budget.max_depth < self.max_depth
+            ):
+                session.max_depth = budget.max_depth
+
+        return session
+
+    def initialize_session_converter(self, incremental=False):
+        """
+        Initialize the session to zero.
+
+        :param incremental: Whether the finished blocks should be queued
+            to be yielded by :meth:`iter_blocks` instead of being stored.
+        :type incremental: bool
+        """
         self._entity_cursor = 0
         self._entities = {}
+        self._entity_keys = {} if self.dedupe_entities else None
         self._blocks = []
+        self._open_block_indexes = []
+        self._finished_blocks = [] if incremental else None
+        self._memo = _BlockMemo() if self.memoize_blocks else None
+        self._recordings = []
 
-    def _process_element_for_block(
-        self, block, element: Tag, parent_element: Optional[Tag]
-    ):
-        for node in element.contents:
-            # If the node is a string, append it to the text
-            if isinstance(node, str):
-                block["text"] += node.strip("\n")
-                continue
+    def _walk_block(self, element, parent: Optional["Tag"]):
+        """
+        Converts a block element and its children, using an explicit stack
+        instead of recursing into every element.
 
-            tag_name = node.name.lower()
+        Yields every time a block was finished.
+        """
+        block = self.open_block(element, parent)
+
+        # The elements being processed, from the outermost to the innermost:
+        # their remaining children, the element, its parent, the block being
+        # populated and its text, the text position of the element
+        # and the kind of its tag.
+        stack = [
+            (
+                iter(element.contents),
+                element,
+                parent,
+                block,
+                block.text,
+                0,
+                BLOCK_TAG,
+            )
+        ]
+        tag_kinds = self._tag_kinds
+        max_depth = self.max_depth
+        instrumentation = self._instrumentation
+        memo = self._memo
+        recordings = self._recordings
+        budget = self._budget
+
+        while stack:
+            children, element, parent_element, block, text, start_pos, kind = stack[-1]
+
+            if instrumentation is not None:
+                instrumentation.maximum("max_depth", len(stack))
+
+            for node in children:
+                if instrumentation is not None:
+                    instrumentation.incr("nodes")
+                if budget is not None:
+                    self.consume_node()
+
+                # If the node is a string, append it to the text
+                if isinstance(node, str):
+                    text.append(node.strip("\n"))
+                    continue
 
-            # If the node is a block, build a block
-            if tag_name in self.blocks_types or tag_name in self.typed_blocks_types:
-                if (
-                    parent_element is not None
-                    and parent_element.name.lower() in self._all_inline_tags
-                ):
+                tag_name = node.name
+                tag_kind = tag_kinds.get(tag_name)
+                if tag_kind is None:
+                    tag_name = tag_name.lower()
+                    tag_kind = tag_kinds.get(tag_name)
+
+                if max_depth is not None and len(stack) >= max_depth:
                     self.dispatch_error(
-                        "Doesn't support blocks within a inline tag (invalid)",
+                        "Maximum nesting depth exceeded",
+                        "max_depth",
+                        max_depth,
                         tag_name,
-                        node,
-                        parent_element,
+                        error_class=BudgetExceededError,
                     )
                     continue
 
-                # Build the block
-                self.build_block(node, element)
+                # If the node is a block, build a block
+                if tag_kind == BLOCK_TAG:
+                    if (
+                        parent_element is not None
+                        and parent_element.name.lower() in self._all_inline_tags
+                    ):
+                        self.dispatch_error(
+                            "Doesn't support blocks within a inline tag (invalid)",
+                            tag_name,
+                            node,
+                            parent_element,
+                        )
+                        continue
+
+                    # Reuse the conversion of an identical block element,
+                    # or record it if it was already met
+                    if memo is not None:
+                        memo_key = memo.get_key(
+                            node, element, len(stack) if max_depth is not None else None
+                        )
+                        record = memo.get_record(memo_key)
+
+                        if record is not None:
+                            self.replay_block(record, memo.keep_keys)
+                            yield
+                            continue
+
+                        if (
+                            memo.should_record(memo_key)
+                            and len(recordings) < MAX_RECORDING_DEPTH
+                        ):
+                            recordings.append(
+                                _BlockRecord(
+                                    node,
+                                    memo_key,
+                                    len(self._blocks),
+                                )
+                            )
+
+                    # Build the block
+                    new_block = self.open_block(node, element)
+                    stack.append(
+                        (
+                            iter(node.contents),
+                            node,
+                            element,
+                            new_block,
+                            new_block.text,
+                            0,
+                            BLOCK_TAG,
+                        )
+                    )
+                    break
 
-                # Stop there, we don't need to post-process blocks
-                continue
+                # Check if the node is a inline tag, then
+                if tag_kind is None and tag_name:
+                    self.dispatch_error("Unsupported tag in block", tag_name, node)
+                    continue
 
-            # Check if the node is a inline tag, then
-            if tag_name not in self._all_inline_tags and tag_name:
-                self.dispatch_error("Unsupported tag in block", tag_name, node)
-                continue
+                # Process the inline tags
+                stack.append(
+                    (
+                        iter(node.contents),
+                        node,
+                        element,
+                        block,
+                        text,
+                        len(text),
+                        tag_kind,
+                    )
+                )
+                break
+            else:
+                # All the children of the element were processed
+                stack.pop()
+
+                if kind == BLOCK_TAG:
+                    # Finalize the block data
+                    self.finish_block(block)
+
+                    if recordings and recordings[-1].element is element:
+                        record = recordings.pop()
+                        if record.replayable:
+                            record.finalize()
+                            memo.add_record(record)
+
+                    yield
+                elif kind == ENTITY_TAG:
+                    length = len(text) - start_pos
+
+                    if instrumentation is None:
+                        self.build_entity(element, block, start_pos, length)
+                    else:
+                        with instrumentation.phase("entities"):
+                            self.build_entity(element, block, start_pos, length)
+                elif kind == TEXT_TAG:
+                    self.handle_text_tag(element, block)
+                else:
+                    length = len(text) - start_pos
+                    self.handle_inline(element, block, start_pos, length)
+
+    def open_block(self, element, parent: Optional["Tag"] = None):
+        """
+        Creates and stores an empty block for a given element, ready to get populated.
 
-            # Process the inline tags
-            start_pos = len(block["text"])
-            self._process_element_for_block(block, node, element)
-            end_pos = len(block["text"])
+        :param element:
+        :type element: Tag
 
-            length = end_pos - start_pos
+        :return: The new block.
+        :rtype: Block
+        """
+        # The root block is not counted
+        if self._budget is not None and parent is not None:
+            self.consume_blocks(1)
 
-            if tag_name in self.entities_types:
-                self.build_entity(node, block, start_pos, length)
-            elif tag_name in self.text_tags:
-                self.handle_text_tag(node, block)
-            else:
-                self.handle_inline(node, block, start_pos, length)
+        block = self.create_default_block()
+        block.text = TextBuilder()
+
+        # Reserve the position of the block, it gets released if it ends up empty
+        self._open_block_indexes.append(len(self._blocks))
+        self.append_block(block)
 
-    def build_block(self, element, parent: Optional[Tag] = None):
+        element_name = element.name.lower()
+        if element_name in self.typed_blocks_types:
+            block.type = self.get_typed_block_type(element, parent)
+
+        return block
+
+    def finish_block(self, block):
+        """
+        Finalizes the data of a block once its element was entirely processed.
+
+        :param block:
+        :type block: Block
+        """
+        index = self._open_block_indexes.pop()
+        block.text = str(block.text)
+
+        if self.is_empty_block(block):
+            if self._finished_blocks is None:
+                self._blocks[index] = None
+            if self._instrumentation is not None:
+                self._instrumentation.incr("empty_blocks")
+            return
+
+        block.key = self.key_generator(block)
+
+        if self._instrumentation is not None:
+            self._instrumentation.incr("blocks")
+
+        if self._finished_blocks is not None:
+            self._finished_blocks.append(block)
+
+        if self._recordings:
+            self.record_block(index, block)
+
+    def record_block(self, index, block):
+        """
+        Records a finished block into the block elements being recorded.
+
+        :param index: The position of the block in the session.
+        :type index: int
+
+        :param block:
+        :type block: Block
+        """
+        block = block.copy()
+        for record in self._recordings:
+            record.blocks.append((index - record.block_start, block))
+
+    def replay_block(self, record, keep_keys=False):
+        """
+        Appends the blocks and entities of a recorded block element,
+        as if the element was converted again.
+
+        :param record:
+        :type record: _BlockRecord
+
+        :param keep_keys: Whether the blocks should keep their recorded key
+            instead of being given a new one.
+        :type keep_keys: bool
+        """
+        if self._budget is not None:
+            self.consume_blocks(len(record.blocks))
+
+        entity_keys = {
+            key: self.append_entity(dict(entity, data=dict(entity["data"])))
+            for key, entity in record.entities
+        }
+        blocks = []
+
+        # The keys are generated in the order the blocks were finished
+        for _, block in record.blocks:
+            block = block.copy()
+            block.remap_entity_keys(entity_keys)
+            if not keep_keys:
+                block.key = self.key_generator(block)
+            blocks.append(block)
+
+        # The blocks are stored in the order their element was opened
+        order = record.order
+        block_start = len(self._blocks)
+
+        if self._finished_blocks is None:
+            self._blocks.extend(blocks[i] for i in order)
+        else:
+            self._finished_blocks.extend(blocks)
+
+        if self._recordings:
+            positions = {i: block_start + rank for rank, i in enumerate(order)}
+            for i, block in enumerate(blocks):
+                self.record_block(positions[i], block)
+
+        if self._instrumentation is not None:
+            self._instrumentation.incr("blocks", len(blocks))
+            self._instrumentation.incr("memoized_blocks")
+
+    def build_block(self, element, parent: Optional["Tag"] = None):
         """
         :param element:
         :type element: Tag
@@ -176,34 +833,98 @@ class SoupConverter(object):
         if element is None:
             return
 
-        # Create and store an empty block, ready to get populated
-        block = self.create_default_block()
-        self.append_block(block)
+        for _ in self.walk_block(element, parent):
+            pass
 
-        element_name = element.name.lower()
-        if element_name in self.typed_blocks_types:
-            block["type"] = self.get_typed_block_type(element, parent)
+    def walk_block(self, element, parent: Optional["Tag"] = None):
+        """
+        Converts a block element and its children, yielding every time a block
+        was finished. Stops once a budget was exceeded.
 
-        # Convert the HTML content to DraftJS
-        self._process_element_for_block(block, element, parent)
+        :param element:
+        :type element: Tag
+        """
+        try:
+            yield from self._walk_block(element, parent)
+        except _BudgetExhausted:
+            self.stop_conversion()
+
+    def consume_node(self):
+        """Counts a visited node against the budget of the session."""
+        self._visited_nodes += 1
+        budget = self._budget
+
+        if budget.max_nodes is not None and self._visited_nodes > budget.max_nodes:
+            self.exceed_budget("max_nodes", budget.max_nodes)
+
+        if (
+            self._deadline is not None
+            and not self._visited_nodes % DEADLINE_CHECK_INTERVAL
+            and time.monotonic() > self._deadline
+        ):
+            self.exceed_budget("timeout", budget.timeout)
+
+    def consume_blocks(self, count):
+        """Counts opened block elements against the budget of the session."""
+        self._opened_blocks += count
+        budget = self._budget
+
+        if budget.max_blocks is not None and self._opened_blocks > budget.max_blocks:
+            self.exceed_budget("max_blocks", budget.max_blocks)
+
+    def exceed_budget(self, name, limit):
+        """
+        Dispatches the error of an exceeded budget, then stops the conversion.
 
-        # Finalize the block data
-        block["key"] = self.key_generator(block)
+        :param name: The name of the budget, e.g. ``max_nodes``.
+        :type name: str
 
-    def get_typed_block_type(self, element: Tag, parent: Optional[Tag]) -> str:
-        definitions = self.typed_blocks_types[element.name.lower()]
-        if isinstance(definitions, str):
-            return definitions
+        :param limit: The limit of the budget.
+        :type limit: Union[int, float]
+        """
+        self.dispatch_error(
+            "Conversion budget exceeded", name, limit, error_class=BudgetExceededError
+        )
+        raise _BudgetExhausted()
+
+    def limit_input(self, html):
+        """
+        :return: The HTML, truncated to the ``max_bytes`` budget of the session.
+        :rtype: Union[str, bytes]
+        """
+        budget = self._budget
+        if budget is None or budget.max_bytes is None or len(html) <= budget.max_bytes:
+            return html
+
+        self.dispatch_error(
+            "Conversion budget exceeded",
+            "max_bytes",
+            budget.max_bytes,
+            error_class=BudgetExceededError,
+        )
+        return html[: budget.max_bytes]
+
+    def stop_conversion(self):
+        """Finishes the blocks left opened by a conversion exceeding its budget."""
+        if self._finished_blocks is not None:
+            # The opened blocks are not stored by the incremental sessions
+            del self._open_block_indexes[:]
+            return
+
+        while self._open_block_indexes:
+            self.finish_block(self._blocks[self._open_block_indexes[-1]])
+
+    def get_typed_block_type(self, element: "Tag", parent: Optional["Tag"]) -> str:
+        tag_name = element.name.lower()
 
         if parent is not None:
-            parent_name = parent.name.lower()
-            for spec in definitions:  # type: dict
-                if spec["parent"] == parent_name:
-                    return spec["type"]
+            block_type = self._typed_block_types.get((tag_name, parent.name.lower()))
+            if block_type is not None:
+                return block_type
 
-        return "unstyled"
+        return self._typed_block_types.get((tag_name, None), "unstyled")
 
-    def handle_text_tag(self, node: Tag, block):
+    def handle_text_tag(self, node: "Tag", block):
         """
         :param node: The tag node being processed.
         :type node: Tag
@@ -214,15 +935,15 @@ class SoupConverter(object):
         :return:
         """
 
-        block["text"] += self.text_tags[node.name.lower()]
+        block.text.append(self.text_tags[node.name.lower()])
 
-    def handle_inline(self, node: Tag, block, start_pos, length):
+    def handle_inline(self, node: "Tag", block, start_pos, length):
         """
         :param node: The tag node being processed.
         :type node: Tag
 
         :param block: The block being processed.
-        :type block: dict
+        :type block: Block
 
         :return:
         """
@@ -230,19 +951,12 @@ class SoupConverter(object):
             self.dispatch_error("Inline styles cannot have empty inner", node)
             return
 
-        styles = block["inlineStyleRanges"]
-        styles.append(
-            {
-                "offset": start_pos,
-                "length": length,
-                "style": self.inlines_types[node.name.lower()],
-            }
-        )
+        block.add_style_range(start_pos, length, self._style_ids[node.name.lower()])
 
-    def build_entity(self, node: Tag, block, start_pos, length):
+    def build_entity(self, node: "Tag", block, start_pos, length):
         """
         :param current_block: The block being processed.
-        :type current_block: dict
+        :type current_block: Block
 
         :return:
         """
@@ -271,20 +985,20 @@ class SoupConverter(object):
         }
 
         key = self.append_entity(entity)
-        block_entities = block["entityRanges"]
-        block_entities.append({"offset": start_pos, "length": length, "key": key})
+        block.add_entity_range(start_pos, length, key)
 
     @staticmethod
     def warn(msg):
         warnings.warn(msg)
 
-    def dispatch_error(self, msg, *args):
+    def dispatch_error(self, msg, *args, error_class=ValueError):
         """
         Dispatch an error caused by an unhandled event.
 
         - If the converter was called in strict mode, it will raise a ValueError.
         - If the converter is not in strict mode (default), it will ignore the error
-          and simply generate a warning.
+          and simply generate a warning, or record it into the diagnostics
+          of the session if any.
 
         :param msg:
         :type msg: str
@@ -292,53 +1006,223 @@ class SoupConverter(object):
         :param args:
         :type args: Any
 
+        :param error_class: The error raised in strict mode.
+        :type error_class: Type[ValueError]
+
         :return:
         """
+        if self._instrumentation is not None:
+            self._instrumentation.incr("warnings")
+
+        for record in self._recordings or ():
+            record.replayable = False
+
         if self.strict:
-            raise ValueError(msg, *args)
+            raise error_class(msg, *args)
+
+        if self._diagnostics is not None:
+            self._diagnostics.record(msg, args)
+            return
+
         self.warn("{}: {}".format(msg, repr(args)))
 
-    def clean_block(self):
-        blocks_to_remove = [
-            block
-            for block in self._blocks
-            if not block["entityRanges"] and not block["text"]
-        ]
+    @staticmethod
+    def is_empty_block(block):
+        return block.is_empty()
+
+    @staticmethod
+    def sort_block_ranges(block):
+        block.sort_ranges()
 
-        for block in blocks_to_remove:
-            self._blocks.remove(block)
+    def clean_block(self):
+        """
+        Drops the released and empty blocks and sorts the ranges
+        of the remaining ones, in a single pass.
+        """
+        blocks = []
 
         for block in self._blocks:
-            block["inlineStyleRanges"] = list(
-                sorted(block["inlineStyleRanges"], key=lambda o: o["offset"])
-            )
-            block["entityRanges"] = list(
-                sorted(block["entityRanges"], key=lambda o: o["key"])
-            )
+            if block is None or self.is_empty_block(block):
+                continue
+
+            self.sort_block_ranges(block)
+            blocks.append(block)
+
+        self._blocks = blocks
+
+    def pop_finished_blocks(self):
+        """
+        Yields the blocks that were finished since the last call, along with
+        the entities they are referencing. The yielded entities are then removed
+        from the session, unless they are deduplicated (see ``dedupe_entities``).
+
+        :return: The ``(block, entity_map)`` pairs, the blocks being built
+            as Draft JS dictionaries.
+        :rtype: Iterator[Tuple[dict, dict]]
+        """
+        finished_blocks, self._finished_blocks = self._finished_blocks, []
+
+        # The deduplicated entities can be referenced by the next blocks
+        get_entity = self._entities.pop
+        if self._entity_keys is not None:
+            get_entity = self._entities.__getitem__
+
+        for block in finished_blocks:
+            self.sort_block_ranges(block)
+            entity_map = {}
+            for key in block.entity_keys:
+                key = str(key)
+                entity_map[key] = get_entity(key)
+
+            yield block.to_dict(), entity_map
+
+    def to_blocks(self):
+        """
+        Returns the blocks of the session without building their Draft JS
+        dictionary, e.g. to only read their text.
+
+        :rtype: List[Block]
+        """
+        if self._instrumentation is None:
+            self.clean_block()
+        else:
+            with self._instrumentation.phase("clean"):
+                self.clean_block()
+
+        return self._blocks
 
     def to_dict(self):
-        self.clean_block()
-        return {"entityMap": self._entities, "blocks": self._blocks}
+        blocks = self.to_blocks()
+        return {
+            "entityMap": self._entities,
+            "blocks": [block.to_dict() for block in blocks],
+        }
 
-    def convert(self, soup: BeautifulSoup):
+    def to_json(self):
+        """
+        Serializes the result to compact JSON, without building the dictionaries
+        of the blocks (see :func:`html_to_draftjs.serialization.dumps`).
+
+        :rtype: str
+        """
+        return serialization.dumps(self._entities, self.to_blocks())
+
+    def write_json(self, fp):
+        """
+        Writes the result as compact UTF-8 JSON into a binary file,
+        without building the dictionaries of the blocks.
+
+        :param fp: The binary file-like object.
+        :type fp: BinaryIO
+        """
+        serialization.dump(self._entities, self.to_blocks(), fp)
+
+    @staticmethod
+    def find_root(soup: "BeautifulSoup", root=None, selector=None):
+        """
+        Finds the element to convert, the body of the document by default.
+
+        :param soup:
+        :type soup: "BeautifulSoup"
+
+        :param root: The element to convert, instead of the body.
+        :type root: Optional["Tag"]
+
+        :param selector: A CSS selector of the element to convert,
+            instead of the body.
+        :type selector: Optional[str]
+
+        :return: The element, None if not found.
+        :rtype: Optional["Tag"]
+        """
+        if root is not None:
+            if selector is not None:
+                raise ValueError("Pass either a root element or a selector")
+            return root
+
+        return soup.select_one("body" if selector is None else selector)
+
+    def convert(
+        self,
+        soup: "BeautifulSoup",
+        instrumentation=None,
+        diagnostics=None,
+        root=None,
+        selector=None,
+        budget=None,
+    ):
         """
         Converts the passed bs4 soup into a standard Draft JS JSON format
         as a python dictionary.
 
         :param soup:
-        :type soup: BeautifulSoup
+        :type soup: "BeautifulSoup"
 
-        :return:
+        :param instrumentation: Records the timings and counters of the conversion.
+        :type instrumentation: Optional[Instrumentation]
+
+        :param diagnostics: Collects the errors instead of generating warnings.
+        :type diagnostics: Optional[Diagnostics]
+
+        :param root: The element to convert, as if it was the body of the document.
+        :type root: Optional["Tag"]
+
+        :param selector: A CSS selector of the element to convert, as if it was
+            the body of the document.
+        :type selector: Optional[str]
+
+        :param budget: Limits the resources used by the conversion,
+            defaults to the budget of the converter. The input being already
+            parsed, its ``max_bytes`` is not checked.
+        :type budget: Optional[Budget]
+
+        :return: The conversion session holding the result.
         :rtype: SoupConverter
         """
 
-        # Populate the session
-        self.initialize_session_converter()
+        session = self.new_session(
+            instrumentation=instrumentation, diagnostics=diagnostics, budget=budget
+        )
+
+        body = self.find_root(soup, root, selector)  # type: Optional["Tag"]
+
+        if instrumentation is None:
+            session.build_block(body)
+        else:
+            with instrumentation.phase("walk"):
+                session.build_block(body)
+
+        return session
+
+    def iter_blocks(self, soup: "BeautifulSoup", root=None, selector=None):
+        """
+        Converts the passed bs4 soup and yields the Draft JS blocks as soon as
+        they are finished, instead of storing them.
+
+        The blocks are yielded in the order their tag is closed, meaning a block
+        nested into another block is yielded before its parent. This is the same
+        order than :meth:`to_dict` unless text is put around nested blocks, e.g.
+        ``<blockquote>text<p>nested</p></blockquote>``.
+
+        :param soup:
+        :type soup: "BeautifulSoup"
 
-        body = soup.select_one("body")  # type: Optional[Tag]
+        :param root: The element to convert, instead of the body.
+        :type root: Optional["Tag"]
 
-        if not Tag:
-            return self
+        :param selector: A CSS selector of the element to convert,
+            instead of the body.
+        :type selector: Optional[str]
 
-        self.build_block(body)
-        return self
+        :return: The finished blocks, along with the entities they are referencing.
+        :rtype: Iterator[Tuple[dict, dict]]
+        """
+        session = self.new_session(incremental=True)
+
+        body = self.find_root(soup, root, selector)  # type: Optional["Tag"]
+
+        if body is None:
+            return
+
+        for _ in session.walk_block(body, None):
+            yield from session.pop_finished_blocks()
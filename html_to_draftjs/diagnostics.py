@@ -0,0 +1,124 @@
+import warnings
+
+__all__ = ["Diagnostic", "Diagnostics"]
+
+
+class _TagSnapshot(object):
+    """
+    The name and attributes of a tag, stored instead of the tag which would
+    keep its whole tree alive.
+    """
+
+    __slots__ = ("name", "attrs")
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = dict(attrs)
+
+    def __repr__(self):
+        # Formatted without the tag's children
+        return "<{}{}>".format(
+            self.name,
+            "".join(' {}="{}"'.format(key, value) for key, value in self.attrs.items()),
+        )
+
+
+def _snapshot(arg):
+    """Copies an argument of an error, without referencing the tree it comes from."""
+    name = getattr(arg, "name", None)
+    attrs = getattr(arg, "attrs", None)
+
+    if isinstance(name, str) and hasattr(attrs, "items"):
+        return _TagSnapshot(name, attrs)
+
+    # The bs4 strings reference their parent
+    if isinstance(arg, str):
+        return str(arg)
+
+    return arg
+
+
+class Diagnostic(object):
+    """
+    An error dispatched by a conversion, only formatted when needed.
+
+    Its tags are stored as snapshots of their name and attributes.
+    """
+
+    __slots__ = ("message", "args")
+
+    def __init__(self, message, args):
+        self.message = message
+        self.args = tuple(_snapshot(arg) for arg in args)
+
+    def __str__(self):
+        return "{}: ({})".format(
+            self.message, ", ".join(repr(arg) for arg in self.args)
+        )
+
+    def __repr__(self):
+        return "<Diagnostic {}>".format(self)
+
+
+class Diagnostics(object):
+    """
+    Collects the errors dispatched by non-strict conversions, instead of
+    formatting them and generating a warning for every one of them.
+
+    Every error is counted by message, but only the first ones are stored.
+
+    :param limit: The maximum number of stored errors.
+    :type limit: int
+    """
+
+    def __init__(self, limit=100):
+        self.limit = limit
+        self.records = []
+        self.counts = {}
+
+    def record(self, message, args):
+        self.counts[message] = self.counts.get(message, 0) + 1
+
+        if len(self.records) < self.limit:
+            self.records.append(Diagnostic(message, args))
+
+    @property
+    def total(self):
+        """The number of dispatched errors."""
+        return sum(self.counts.values())
+
+    @property
+    def dropped(self):
+        """The number of errors that were counted but not stored."""
+        return self.total - len(self.records)
+
+    def as_dict(self):
+        """
+        :return: The counts by message and the stored errors, formatted.
+        :rtype: dict
+        """
+        return {
+            "counts": dict(self.counts),
+            "records": [str(record) for record in self.records],
+            "dropped": self.dropped,
+        }
+
+
+class _DeferredWarnings(Diagnostics):
+    """
+    Collects the warnings of a conversion which may be started again,
+    to only emit them once its result is kept.
+    """
+
+    def __init__(self):
+        super().__init__(limit=0)
+        self.warnings = []
+
+    def record(self, message, args):
+        super().record(message, args)
+        # Formatted as the warnings of the converters
+        self.warnings.append("{}: {}".format(message, repr(args)))
+
+    def emit(self):
+        for message in self.warnings:
+            warnings.warn(message)
@@ -0,0 +1,18 @@
+__all__ = ["BudgetExceededError"]
+
+
+class BudgetExceededError(ValueError):
+    """
+    Raised by the strict conversions exceeding one of their budgets
+    (see :class:`html_to_draftjs.budget.Budget`), or their maximum depth.
+
+    Its arguments are the message, the name of the budget and its limit.
+    """
+
+    @property
+    def budget(self):
+        return self.args[1]
+
+    @property
+    def limit(self):
+        return self.args[2]
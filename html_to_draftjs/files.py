@@ -0,0 +1,186 @@
+import codecs
+import io
+import mmap
+import os
+import re
+from contextlib import contextmanager
+
+from html_to_draftjs.stream import CHUNK_SIZE
+
+__all__ = [
+    "decode_html",
+    "iter_decoded_chunks",
+    "open_html_bytes",
+    "sniff_encoding",
+]
+
+# The files from this size are memory-mapped instead of being read
+MMAP_THRESHOLD = 1024 * 1024
+
+# The number of bytes looked up for a ``<meta>`` declaring the encoding,
+# as browsers do
+SNIFF_SIZE = 1024
+
+# The encoding used when the HTML is not valid UTF-8 and declares no encoding
+FALLBACK_ENCODING = "windows-1252"
+
+# The byte order marks, the UTF-32 ones being looked up before the UTF-16 ones
+# they start with
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+_META_CHARSET = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_:.-]+)""", re.IGNORECASE
+)
+
+
+@contextmanager
+def _read_file(fp):
+    """Memory-maps a binary file from its current position if it is large enough,
+    otherwise reads it."""
+    try:
+        size = os.fstat(fp.fileno()).st_size
+        position = fp.tell()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        size = position = 0
+
+    if position or size < MMAP_THRESHOLD:
+        yield fp.read()
+        return
+
+    mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield mapped
+    finally:
+        mapped.close()
+
+
+@contextmanager
+def open_html_bytes(source):
+    """
+    Gives access to the bytes of some HTML, without copying them if possible.
+
+    :param source: The HTML bytes, the path of a file or a binary file object.
+    :type source: Union[bytes, bytearray, memoryview, str, os.PathLike, BinaryIO]
+
+    :return: A context manager giving the bytes (or a memory map of the file).
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield source
+    elif isinstance(source, str) or hasattr(source, "__fspath__"):
+        with open(source, "rb") as fp, _read_file(fp) as data:
+            yield data
+    else:
+        with _read_file(source) as data:
+            yield data
+
+
+def sniff_encoding(data, encoding=None):
+    """
+    Looks up the encoding of HTML bytes, from (by order of precedence):
+    the passed encoding, the byte order mark, the encoding declared by a
+    ``<meta>`` tag in the first bytes.
+
+    :param data:
+    :type data: bytes
+
+    :param encoding: The known encoding of the bytes, if any.
+    :type encoding: Optional[str]
+
+    :return: The encoding, ``None`` if it is not known, and the position
+        the HTML starts at (after the BOM).
+    :rtype: Tuple[Optional[str], int]
+    """
+    head = bytes(data[:SNIFF_SIZE])
+
+    if encoding is not None:
+        # Skip the byte order mark of the passed encoding, the codecs
+        # detecting it themselves (e.g. utf-16) being given as is
+        name = codecs.lookup(encoding).name
+        for bom, bom_encoding in _BOMS:
+            if bom_encoding == name and head.startswith(bom):
+                return encoding, len(bom)
+        return encoding, 0
+
+    for bom, bom_encoding in _BOMS:
+        if head.startswith(bom):
+            return bom_encoding, len(bom)
+
+    match = _META_CHARSET.search(head)
+    if match is not None:
+        try:
+            declared = codecs.lookup(match.group(1).decode("ascii")).name
+        except LookupError:
+            pass
+        else:
+            # The declaration was read as ASCII, thus it cannot be UTF-16/32
+            if declared.startswith(("utf-16", "utf-32")):
+                declared = "utf-8"
+            return declared, 0
+
+    return None, 0
+
+
+def decode_html(data, encoding=None):
+    """
+    Decodes HTML bytes in the encoding found by :func:`sniff_encoding`,
+    the invalid bytes being replaced.
+
+    If the encoding is not known, the bytes are decoded as UTF-8, and only
+    decoded again as windows-1252 if they are not valid UTF-8.
+
+    :param data:
+    :type data: bytes
+
+    :param encoding: The known encoding of the bytes, if any.
+    :type encoding: Optional[str]
+
+    :rtype: str
+    """
+    encoding, start = sniff_encoding(data, encoding)
+
+    if encoding is None:
+        try:
+            return str(data[start:], "utf-8")
+        except UnicodeDecodeError:
+            encoding = FALLBACK_ENCODING
+
+    return str(data[start:], encoding, "replace")
+
+
+def iter_decoded_chunks(
+    data, encoding, start=0, chunk_size=CHUNK_SIZE, errors="replace"
+):
+    """
+    Decodes HTML bytes chunk by chunk, the invalid bytes being replaced.
+
+    :param data:
+    :type data: bytes
+
+    :param encoding:
+    :type encoding: str
+
+    :param start: The position to start decoding from.
+    :type start: int
+
+    :param chunk_size: The number of bytes decoded at once.
+    :type chunk_size: int
+
+    :param errors: How the invalid bytes are handled, ``strict`` raising
+        a :exc:`UnicodeDecodeError`.
+    :type errors: str
+
+    :rtype: Iterator[str]
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors)
+
+    for start in range(start, len(data), chunk_size):
+        end = start + chunk_size
+        yield decoder.decode(data[start:end])
+
+    yield decoder.decode(b"", final=True)
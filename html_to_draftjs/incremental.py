@@ -0,0 +1,183 @@
+import hashlib
+import sys
+from collections import namedtuple
+
+from html_to_draftjs.cache import converter_fingerprint
+
+__all__ = ["IncrementalResult", "Manifest", "convert_incremental"]
+
+# The outcome of an incremental conversion: ``result`` is the Draft JS data and
+# ``manifest`` the conversion of its top-level block elements, to be reused by
+# the next conversion. ``reused`` and ``converted`` are the number of top-level
+# block elements reused from the previous conversion and converted again.
+IncrementalResult = namedtuple(
+    "IncrementalResult", ["result", "manifest", "reused", "converted"]
+)
+
+# The recorded conversion of the top-level block elements of a document,
+# by hash of their source, along with the configuration they were converted with
+Manifest = namedtuple("Manifest", ["fingerprint", "records"])
+
+
+def hash_element(element):
+    """
+    :return: A hash of the source of an element, a bs4 tag or a lxml element.
+    :rtype: bytes
+    """
+    # An element can only be a lxml element if lxml was imported
+    etree = sys.modules.get("lxml.etree")
+    if etree is not None and isinstance(element, etree._Element):
+        source = etree.tostring(element, with_tail=False)
+    else:
+        source = element.encode()
+
+    return hashlib.sha256(source).digest()
+
+
+class _SegmentMemo(object):
+    """
+    Replaces the block memo of a conversion session to replay the top-level
+    block elements of a previous version of the document, identified by
+    the hash of their source, and record the others.
+
+    The replayed blocks keep their key, thus a record is only replayed once.
+    """
+
+    __slots__ = ("root", "previous", "records", "reused", "converted")
+
+    keep_keys = True
+
+    def __init__(self, root, previous):
+        self.root = root
+
+        # The records of the previous version, by hash
+        self.previous = previous  # type: dict
+
+        # The records of the document, by hash
+        self.records = {}  # type: dict
+
+        self.reused = 0
+        self.converted = 0
+
+    def get_key(self, node, parent, depth):
+        if parent is not self.root:
+            return None
+        return hash_element(node)
+
+    def get_record(self, key):
+        records = self.previous.get(key)
+        if not records:
+            return None
+
+        record = records.pop(0)
+        self.records.setdefault(key, []).append(record)
+        self.reused += 1
+        return record
+
+    def should_record(self, key):
+        if key is None:
+            return False
+
+        self.converted += 1
+        return True
+
+    def add_record(self, record):
+        self.records.setdefault(record.key, []).append(record)
+
+
+def _record_previous(converter, root, previous_result):
+    """
+    Converts the previous version of a document to record its top-level block
+    elements, giving them the keys of the blocks of the previous result when
+    it is the result of the same conversion.
+
+    :return: The records, by hash.
+    :rtype: dict
+    """
+    if root is None:
+        return {}
+
+    session = converter.new_session()
+    memo = session._memo = _SegmentMemo(root, {})
+    session.build_block(root)
+
+    if previous_result is None:
+        return memo.records
+
+    # The recorded copies of the blocks, along with the blocks of the session
+    recorded = [
+        (copy, session._blocks[record.block_start + offset])
+        for records in memo.records.values()
+        for record in records
+        for offset, copy in record.blocks
+    ]
+
+    blocks = session.to_blocks()
+    previous_blocks = previous_result["blocks"]
+    if len(blocks) != len(previous_blocks) or any(
+        block.text != previous["text"]
+        for block, previous in zip(blocks, previous_blocks)
+    ):
+        return memo.records
+
+    positions = {id(block): i for i, block in enumerate(blocks)}
+    for copy, block in recorded:
+        copy.key = previous_blocks[positions[id(block)]]["key"]
+
+    return memo.records
+
+
+def convert_incremental(converter, parse, html, previous_html=None, previous=None):
+    """
+    Converts a document, reusing the conversion of the top-level block elements
+    whose source didn't change since the previous version of the document.
+
+    The unchanged blocks keep their key, the entity map is rebuilt.
+
+    :param converter:
+    :type converter: SoupConverter
+
+    :param parse: Parses HTML and returns the element to convert (the body).
+    :type parse: Callable[[str], Optional[Union[Tag, LxmlElement]]]
+
+    :param html:
+    :type html: Union[str, bytes]
+
+    :param previous_html: The previous version of the document. Only used when
+        the previous result is not an :class:`IncrementalResult` of the same
+        converter: the previous version is then converted again to find
+        its blocks, reusing the keys of the previous result if possible.
+    :type previous_html: Optional[Union[str, bytes]]
+
+    :param previous: The result of the conversion of the previous version.
+    :type previous: Optional[Union[IncrementalResult, dict]]
+
+    :rtype: IncrementalResult
+    """
+    fingerprint = converter_fingerprint(converter)
+    records = None
+
+    if isinstance(previous, IncrementalResult):
+        if previous.manifest.fingerprint == fingerprint:
+            records = {
+                key: list(records) for key, records in previous.manifest.records.items()
+            }
+        else:
+            previous = previous.result
+
+    if records is None:
+        records = {}
+        if previous_html is not None:
+            records = _record_previous(converter, parse(previous_html), previous)
+
+    root = parse(html)
+    session = converter.new_session()
+    memo = session._memo = _SegmentMemo(root, records)
+    session.build_block(root)
+
+    return IncrementalResult(
+        session.to_dict(),
+        Manifest(fingerprint, memo.records),
+        memo.reused,
+        memo.converted,
+    )
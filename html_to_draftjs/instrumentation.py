@@ -0,0 +1,65 @@
+import time
+from contextlib import contextmanager
+
+__all__ = ["Instrumentation"]
+
+
+class Instrumentation(object):
+    """
+    Records the time spent in every phase of conversions, along with counters.
+
+    Pass an instance to a conversion to enable the instrumentation,
+    conversions without instrumentation don't record anything.
+    The same instance can record several conversions, its timings and counters
+    are then accumulated (except ``max_depth`` which keeps the maximum).
+
+    The recorded phases are:
+
+    - ``parse``: the parsing of the HTML into a soup;
+    - ``walk``: the conversion of the elements into blocks, including ``entities``;
+    - ``entities``: the building of the entities;
+    - ``clean``: the cleaning and sorting of the blocks.
+
+    The recorded counters are:
+
+    - ``nodes``: the number of visited nodes (tags and strings);
+    - ``blocks``: the number of emitted blocks;
+    - ``empty_blocks``: the number of dropped empty blocks;
+    - ``entities``: the number of created entities;
+    - ``warnings``: the number of dispatched errors;
+    - ``max_depth``: the maximum nesting depth of the visited tags.
+    - ``memoized_blocks``: the number of block elements whose conversion was
+      reused (see ``memoize_blocks``), their nodes are not visited.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.counters = {}
+
+    def add_time(self, phase, seconds):
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        """Measures the time spent in a phase of the conversion."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def incr(self, counter, value=1):
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def maximum(self, counter, value):
+        if value > self.counters.get(counter, 0):
+            self.counters[counter] = value
+
+    def as_dict(self):
+        """
+        Exports the records, e.g. to send them to a metrics pipeline.
+
+        :return: The timings (in seconds) by phase and the counters.
+        :rtype: dict
+        """
+        return {"timings": dict(self.timings), "counters": dict(self.counters)}
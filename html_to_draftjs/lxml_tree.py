@@ -0,0 +1,276 @@
+from lxml import etree
+
+from html_to_draftjs.converter import SoupConverter
+from html_to_draftjs.selectors import SimpleSelector, parse_simple_selector
+from html_to_draftjs.stream import ASCII_SPACES, PRESERVE_WHITESPACE_TAGS
+
+__all__ = ["LxmlConverter", "LxmlElement"]
+
+
+class LxmlElement(etree.ElementBase):
+    """
+    A lxml element exposing the same interface as a bs4 tag to the converters
+    (``name``, ``attrs`` and ``contents``), thus walked without building
+    a beautifulsoup4 tree.
+    """
+
+    def __repr__(self):
+        # Shown in the errors, the same way as the bs4 tags
+        return etree.tostring(self, encoding=str, with_tail=False)
+
+    @property
+    def name(self):
+        return self.tag
+
+    @property
+    def attrs(self):
+        return self.attrib
+
+    def _normalize(self, text):
+        # Collapse the whitespaces the same way beautifulsoup4 does
+        if text.strip(ASCII_SPACES):
+            return text
+
+        if self.tag in PRESERVE_WHITESPACE_TAGS:
+            return text
+
+        if next(self.iterancestors(*PRESERVE_WHITESPACE_TAGS), None) is not None:
+            return text
+
+        return "\n" if "\n" in text else " "
+
+    @property
+    def contents(self):
+        """
+        The children of the element: the child elements and the strings
+        between them, comments and processing instructions being strings as well.
+        """
+        contents = []
+
+        text = self.text
+        if text:
+            contents.append(self._normalize(text))
+
+        for child in self:
+            if isinstance(child, LxmlElement):
+                contents.append(child)
+            elif isinstance(child, etree._ProcessingInstruction):
+                text = child.target + " " + (child.text or "")
+                contents.append(self._normalize(text))
+            elif isinstance(child, etree._Comment):
+                contents.append(self._normalize(child.text or ""))
+
+            tail = child.tail
+            if tail:
+                contents.append(self._normalize(tail))
+
+        return contents
+
+
+_LOOKUP = etree.ElementDefaultClassLookup(element=LxmlElement)
+
+# The depth from which libxml2 silently drops the nested elements when building
+# its trees, even with ``huge_tree``, unlike when sending them to a parser target
+_MAX_TREE_DEPTH = 2048
+
+# Whether a tree has elements at the maximum depth, evaluated without recursing
+_REACHES_MAX_TREE_DEPTH = etree.XPath("boolean({})".format("/*" * _MAX_TREE_DEPTH))
+
+
+def _create_parser():
+    """
+    Creates a parser building :class:`LxmlElement` trees, the elements built by
+    a parser target being created with the element classes of that parser.
+    """
+    parser = etree.HTMLParser(huge_tree=True)
+    parser.set_element_class_lookup(_LOOKUP)
+    return parser
+
+
+class _SelectionTarget(object):
+    """
+    A lxml parser target only building the first element matched by a selector,
+    along with its children: the events of all the other elements are ignored.
+    """
+
+    def __init__(self, selector: SimpleSelector, parser):
+        self.selector = selector
+        self.builder = etree.TreeBuilder(parser=parser)
+
+        # The depth of the element being built in the selected element,
+        # None until it is found, and -1 once it was built
+        self.depth = None
+
+    def start(self, tag, attrib):
+        if self.depth is None:
+            if not self.selector.matches(tag, attrib):
+                return
+            self.depth = 0
+
+        if self.depth >= 0:
+            self.depth += 1
+            self.builder.start(tag, attrib)
+
+    def end(self, tag):
+        if self.depth is not None and self.depth > 0:
+            self.builder.end(tag)
+            self.depth -= 1
+            if self.depth == 0:
+                self.depth = -1
+
+    def data(self, data):
+        if self.depth is not None and self.depth > 0:
+            self.builder.data(data)
+
+    def comment(self, text):
+        if self.depth is not None and self.depth > 0:
+            self.builder.comment(text)
+
+    def pi(self, target, data=None):
+        if self.depth is not None and self.depth > 0:
+            self.builder.pi(target, data)
+
+    def close(self):
+        if self.depth is None:
+            return None
+        return self.builder.close()
+
+
+class LxmlConverter(SoupConverter):
+    """
+    Converts HTML to Draft JS's JSON format from a tree parsed by lxml,
+    without building a beautifulsoup4 tree.
+
+    It produces the same output than :class:`SoupConverter` would for a soup
+    parsed with the ``lxml`` features.
+    """
+
+    @staticmethod
+    def parse(html, selector=None):
+        """
+        Parses HTML into a lxml tree made of :class:`LxmlElement`.
+
+        :param html:
+        :type html: Union[str, bytes]
+
+        :param selector: Only builds the first element it matches, with its children.
+        :type selector: Optional[SimpleSelector]
+
+        :return: The root element (or the selected one), None if the document
+            is empty (or the selector matched nothing).
+        :rtype: Optional[LxmlElement]
+        """
+        if selector is None:
+            parser = _create_parser()
+            parser.feed(html)
+            root = parser.close()
+            if root is None or not _REACHES_MAX_TREE_DEPTH(root):
+                return root
+
+            # Build the tree again from the events of the parser,
+            # as it may have been truncated
+            target = etree.TreeBuilder(parser=_create_parser())
+        else:
+            target = _SelectionTarget(selector, _create_parser())
+
+        parser = etree.HTMLParser(target=target, huge_tree=True)
+        parser.feed(html)
+        return parser.close()
+
+    @staticmethod
+    def find_body(root):
+        if root is None:
+            return None
+        if root.tag == "body":
+            return root
+        return next(root.iter("body"), None)
+
+    def parse_root(self, html, selector=None):
+        """
+        Parses HTML and returns the element to convert.
+
+        :param html:
+        :type html: Union[str, bytes]
+
+        :param selector: A CSS selector of the element to convert instead of
+            the body, made of a single compound selector (e.g. ``div#content``).
+        :type selector: Optional[str]
+
+        :rtype: Optional[LxmlElement]
+        """
+        if selector is None:
+            return self.find_body(self.parse(html))
+
+        simple_selector = parse_simple_selector(selector)
+        if simple_selector is None:
+            raise ValueError("Unsupported selector for the lxml backend", selector)
+
+        return self.parse(html, simple_selector)
+
+    def convert(
+        self, html, instrumentation=None, diagnostics=None, selector=None, budget=None
+    ):
+        """
+        Parses and converts the passed HTML into a standard Draft JS JSON format
+        as a python dictionary.
+
+        :param html:
+        :type html: Union[str, bytes]
+
+        :param instrumentation: Records the timings and counters of the conversion.
+        :type instrumentation: Optional[Instrumentation]
+
+        :param diagnostics: Collects the errors instead of generating warnings.
+        :type diagnostics: Optional[Diagnostics]
+
+        :param selector: A CSS selector of the element to convert, as if it was
+            the body of the document. Only that element is built.
+        :type selector: Optional[str]
+
+        :param budget: Limits the resources used by the conversion,
+            defaults to the budget of the converter.
+        :type budget: Optional[Budget]
+
+        :return: The conversion session holding the result.
+        :rtype: LxmlConverter
+        """
+        session = self.new_session(
+            instrumentation=instrumentation, diagnostics=diagnostics, budget=budget
+        )
+        html = session.limit_input(html)
+
+        if instrumentation is None:
+            body = self.parse_root(html, selector)
+            session.build_block(body)
+        else:
+            with instrumentation.phase("parse"):
+                body = self.parse_root(html, selector)
+            with instrumentation.phase("walk"):
+                session.build_block(body)
+
+        return session
+
+    def iter_blocks(self, html, selector=None):
+        """
+        Converts the passed HTML and yields the Draft JS blocks as soon as
+        they are finished (see :meth:`SoupConverter.iter_blocks`).
+
+        :param html:
+        :type html: Union[str, bytes]
+
+        :param selector: A CSS selector of the element to convert instead of
+            the body.
+        :type selector: Optional[str]
+
+        :return: The finished blocks, along with the entities they are referencing.
+        :rtype: Iterator[Tuple[dict, dict]]
+        """
+        session = self.new_session(incremental=True)
+
+        body = self.parse_root(session.limit_input(html), selector)
+
+        if body is None:
+            return
+
+        for _ in session.walk_block(body, None):
+            yield from session.pop_finished_blocks()
@@ -0,0 +1,216 @@
+import threading
+from array import array
+from collections.abc import Mapping
+from itertools import chain
+from operator import itemgetter
+
+__all__ = ["Block", "get_style_name", "register_style"]
+
+# The names of the inline styles, indexed by their identifier
+_STYLE_NAMES = []  # type: list
+_STYLE_IDS = {}  # type: dict
+_STYLE_LOCK = threading.Lock()
+
+# The type code of the packed ranges (signed 64 bits integers)
+RANGE_TYPECODE = "q"
+
+
+def register_style(name):
+    """
+    Returns the identifier of an inline style, as stored into the blocks.
+
+    :param name: The Draft JS name of the style, e.g. ``BOLD``.
+    :type name: str
+
+    :rtype: int
+    """
+    style_id = _STYLE_IDS.get(name)
+    if style_id is not None:
+        return style_id
+
+    with _STYLE_LOCK:
+        style_id = _STYLE_IDS.get(name)
+        if style_id is None:
+            style_id = len(_STYLE_NAMES)
+            _STYLE_NAMES.append(name)
+            _STYLE_IDS[name] = style_id
+
+    return style_id
+
+
+def get_style_name(style_id):
+    """
+    :return: The name of a registered inline style.
+    :rtype: str
+    """
+    return _STYLE_NAMES[style_id]
+
+
+def _sort_packed(ranges, field):
+    """Sorts packed ``(offset, length, value)`` ranges by one of their fields."""
+    if ranges is None or len(ranges) <= 3:
+        return ranges
+
+    # The ranges are usually already sorted
+    values = ranges[field::3].tolist()
+    if values == sorted(values):
+        return ranges
+
+    ranges = iter(ranges)
+    triples = sorted(zip(ranges, ranges, ranges), key=itemgetter(field))
+    return array(RANGE_TYPECODE, chain.from_iterable(triples))
+
+
+class Block(Mapping):
+    """
+    A Draft JS block, as built by the converters.
+
+    The ranges are stored as packed ``(offset, length, style or key)`` integer
+    arrays, the Draft JS dictionary of the block is only built by :meth:`to_dict`.
+    The block can also be read as a mapping having the keys of that dictionary,
+    the ranges being built on every access.
+    """
+
+    __slots__ = (
+        "key",
+        "text",
+        "type",
+        "depth",
+        "data",
+        "style_ranges",
+        "entity_ranges",
+    )
+
+    FIELDS = (
+        "key",
+        "text",
+        "type",
+        "depth",
+        "inlineStyleRanges",
+        "entityRanges",
+        "data",
+    )
+
+    def __init__(self, block_type="unstyled"):
+        self.key = ""
+        self.text = ""
+        self.type = block_type
+        self.depth = 0
+        self.data = None  # type: dict
+
+        # Created along with their first range
+        self.style_ranges = None  # type: array
+        self.entity_ranges = None  # type: array
+
+    def add_style_range(self, offset, length, style_id):
+        if self.style_ranges is None:
+            self.style_ranges = array(RANGE_TYPECODE)
+        self.style_ranges.extend((offset, length, style_id))
+
+    def add_entity_range(self, offset, length, key):
+        if self.entity_ranges is None:
+            self.entity_ranges = array(RANGE_TYPECODE)
+        self.entity_ranges.extend((offset, length, key))
+
+    @property
+    def entity_keys(self):
+        """The keys of the entities referenced by the block."""
+        return self.entity_ranges[2::3] if self.entity_ranges else ()
+
+    def remap_entity_keys(self, keys):
+        """
+        Replaces the keys of the entities referenced by the block.
+
+        :param keys: The new keys, by old key.
+        :type keys: Dict[int, int]
+        """
+        ranges = self.entity_ranges
+        if ranges:
+            for i in range(2, len(ranges), 3):
+                ranges[i] = keys[ranges[i]]
+
+    def sort_ranges(self):
+        """Sorts the style ranges by offset and the entity ranges by key."""
+        self.style_ranges = _sort_packed(self.style_ranges, 0)
+        self.entity_ranges = _sort_packed(self.entity_ranges, 2)
+
+    def is_empty(self):
+        return not self.entity_ranges and not self.text
+
+    def copy(self):
+        """
+        :return: A copy of the block, which doesn't share any range nor data.
+        :rtype: Block
+        """
+        block = Block(self.type)
+        block.key = self.key
+        block.text = self.text
+        block.depth = self.depth
+
+        if self.data is not None:
+            block.data = dict(self.data)
+        if self.style_ranges is not None:
+            block.style_ranges = array(RANGE_TYPECODE, self.style_ranges)
+        if self.entity_ranges is not None:
+            block.entity_ranges = array(RANGE_TYPECODE, self.entity_ranges)
+
+        return block
+
+    def get_inline_style_ranges(self):
+        ranges = self.style_ranges
+        if not ranges:
+            return []
+
+        ranges = iter(ranges)
+        return [
+            {"offset": offset, "length": length, "style": _STYLE_NAMES[style_id]}
+            for offset, length, style_id in zip(ranges, ranges, ranges)
+        ]
+
+    def get_entity_ranges(self):
+        ranges = self.entity_ranges
+        if not ranges:
+            return []
+
+        ranges = iter(ranges)
+        return [
+            {"offset": offset, "length": length, "key": key}
+            for offset, length, key in zip(ranges, ranges, ranges)
+        ]
+
+    def to_dict(self):
+        """
+        :return: The Draft JS dictionary of the block.
+        :rtype: dict
+        """
+        return {
+            "key": self.key,
+            "text": str(self.text),
+            "type": self.type,
+            "depth": self.depth,
+            "inlineStyleRanges": self.get_inline_style_ranges(),
+            "entityRanges": self.get_entity_ranges(),
+            "data": dict(self.data) if self.data is not None else {},
+        }
+
+    def __getitem__(self, name):
+        if name == "text":
+            return str(self.text)
+        if name == "inlineStyleRanges":
+            return self.get_inline_style_ranges()
+        if name == "entityRanges":
+            return self.get_entity_ranges()
+        if name == "data":
+            return dict(self.data) if self.data is not None else {}
+        if name in ("key", "type", "depth"):
+            return getattr(self, name)
+        raise KeyError(name)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __repr__(self):
+        return "<Block {!r} {!r}>".format(self.type, str(self.text))
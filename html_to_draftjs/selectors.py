@@ -0,0 +1,114 @@
+import re
+from collections import namedtuple
+
+__all__ = ["SimpleSelector", "parse_simple_selector"]
+
+_TAG = re.compile(r"[a-zA-Z][a-zA-Z0-9-]*")
+_PART = re.compile(
+    r"""
+    \#(?P<id>[\w-]+)
+    | \.(?P<class>[\w-]+)
+    | \[\s*(?P<attr>[\w-]+)\s*
+        (?:=\s*(?:"(?P<dquoted>[^"]*)"|'(?P<squoted>[^']*)'|(?P<value>[\w-]+))\s*)?
+      \]
+    """,
+    re.VERBOSE,
+)
+
+
+class SimpleSelector(namedtuple("SimpleSelector", ("name", "classes", "attrs"))):
+    """
+    A CSS selector matching a single element by its tag name, classes and
+    attributes (e.g. ``div#content.article[role=main]``), which can be matched
+    while parsing, without building the elements around the selected one.
+
+    The value of the attributes is None when only their presence is checked.
+    """
+
+    def matches(self, name, attrs):
+        """
+        :param name: The tag name of the element.
+        :type name: str
+
+        :param attrs: The attributes of the element.
+        :type attrs: Mapping[str, str]
+
+        :rtype: bool
+        """
+        if self.name is not None and name != self.name:
+            return False
+
+        if self.classes:
+            classes = attrs.get("class")
+            if classes is None or not self.classes.issubset(classes.split()):
+                return False
+
+        for attr, value in self.attrs:
+            actual = attrs.get(attr)
+            if actual is None or (value is not None and actual != value):
+                return False
+
+        return True
+
+    def to_strainer_args(self):
+        """
+        :return: The arguments of a bs4 ``SoupStrainer`` keeping at least
+            the elements matched by the selector, along with their children.
+        :rtype: Tuple[Optional[str], dict]
+        """
+        attrs = {}
+        if self.classes:
+            # The class attribute is not yet split into its classes while parsing
+            attrs["class"] = re.compile(
+                r"(?:^|\s){}(?:\s|$)".format(re.escape(min(self.classes)))
+            )
+        for attr, value in self.attrs:
+            attrs[attr] = True if value is None else value
+        return self.name, attrs
+
+
+def parse_simple_selector(selector):
+    """
+    Parses a CSS selector made of a single compound selector, e.g. ``#content``
+    or ``div.article``.
+
+    :param selector:
+    :type selector: str
+
+    :return: The parsed selector, None if it is more complex (combinators,
+        pseudo-classes, selector lists, etc.).
+    :rtype: Optional[SimpleSelector]
+    """
+    selector = selector.strip()
+    name = None
+    classes = set()
+    attrs = []
+
+    position = 0
+    match = _TAG.match(selector)
+    if match is not None:
+        name = match.group().lower()
+        position = match.end()
+
+    while position < len(selector):
+        match = _PART.match(selector, position)
+        if match is None:
+            return None
+
+        position = match.end()
+        if match.group("id") is not None:
+            attrs.append(("id", match.group("id")))
+        elif match.group("class") is not None:
+            classes.add(match.group("class"))
+        else:
+            value = match.group("dquoted")
+            if value is None:
+                value = match.group("squoted")
+            if value is None:
+                value = match.group("value")
+            attrs.append((match.group("attr").lower(), value))
+
+    if name is None and not classes and not attrs:
+        return None
+
+    return SimpleSelector(name, frozenset(classes), tuple(attrs))
@@ -0,0 +1,137 @@
+import json
+from json.encoder import encode_basestring
+
+from html_to_draftjs.model import Block, get_style_name
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+__all__ = ["dumps", "dump"]
+
+# The size of the JSON buffered before being written to a file
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# The JSON of the inline styles, by identifier
+_STYLE_JSON = {}  # type: dict
+
+
+def _encode_value(value):
+    if isinstance(value, str):
+        return encode_basestring(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _encode_style(style_id):
+    encoded = _STYLE_JSON.get(style_id)
+    if encoded is None:
+        encoded = _STYLE_JSON[style_id] = encode_basestring(get_style_name(style_id))
+    return encoded
+
+
+def _iter_block_chunks(block: Block):
+    """Yields the JSON of a block, piece by piece."""
+    yield '{"key":%s,"text":%s,"type":%s,"depth":%d,"inlineStyleRanges":[' % (
+        _encode_value(block.key),
+        encode_basestring(str(block.text)),
+        _encode_value(block.type),
+        block.depth,
+    )
+
+    ranges = block.style_ranges
+    if ranges:
+        ranges = iter(ranges)
+        yield ",".join(
+            '{"offset":%d,"length":%d,"style":%s}'
+            % (offset, length, _encode_style(style_id))
+            for offset, length, style_id in zip(ranges, ranges, ranges)
+        )
+
+    yield '],"entityRanges":['
+
+    ranges = block.entity_ranges
+    if ranges:
+        ranges = iter(ranges)
+        yield ",".join(
+            '{"offset":%d,"length":%d,"key":%d}' % entity_range
+            for entity_range in zip(ranges, ranges, ranges)
+        )
+
+    yield '],"data":%s}' % (_encode_value(block.data) if block.data else "{}")
+
+
+def _iter_chunks(entities, blocks):
+    """Yields the JSON of a Draft JS document, piece by piece."""
+    yield '{"entityMap":'
+    yield json.dumps(entities, ensure_ascii=False, separators=(",", ":"))
+    yield ',"blocks":['
+
+    for i, block in enumerate(blocks):
+        if i:
+            yield ","
+        yield from _iter_block_chunks(block)
+
+    yield "]}"
+
+
+def _default(value):
+    if isinstance(value, Block):
+        return value.to_dict()
+    raise TypeError
+
+
+def dumps(entities, blocks):
+    """
+    Serializes a Draft JS document to compact JSON, using ``orjson`` if installed.
+
+    :param entities: The entity map.
+    :type entities: dict
+
+    :param blocks: The blocks of the document.
+    :type blocks: List[Block]
+
+    :rtype: str
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            {"entityMap": entities, "blocks": blocks}, default=_default
+        ).decode("utf-8")
+
+    return "".join(_iter_chunks(entities, blocks))
+
+
+def dump(entities, blocks, fp):
+    """
+    Writes a Draft JS document as compact UTF-8 JSON into a binary file,
+    using ``orjson`` if installed.
+
+    :param entities: The entity map.
+    :type entities: dict
+
+    :param blocks: The blocks of the document.
+    :type blocks: List[Block]
+
+    :param fp: The binary file-like object.
+    :type fp: BinaryIO
+    """
+    if orjson is not None:
+        fp.write(
+            orjson.dumps({"entityMap": entities, "blocks": blocks}, default=_default)
+        )
+        return
+
+    buffer = []
+    size = 0
+
+    for chunk in _iter_chunks(entities, blocks):
+        buffer.append(chunk)
+        size += len(chunk)
+
+        if size >= WRITE_BUFFER_SIZE:
+            fp.write("".join(buffer).encode("utf-8"))
+            buffer = []
+            size = 0
+
+    if buffer:
+        fp.write("".join(buffer).encode("utf-8"))
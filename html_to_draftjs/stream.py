@@ -0,0 +1,561 @@
+import codecs
+from collections import namedtuple
+from html.parser import HTMLParser
+from typing import Optional
+
+from html_to_draftjs.converter import (
+    BLOCK_TAG,
+    ENTITY_TAG,
+    TEXT_TAG,
+    SoupConverter,
+    _BudgetExhausted,
+)
+from html_to_draftjs.exceptions import BudgetExceededError
+
+__all__ = ["PushSession", "StreamConverter", "STREAM_FEATURES"]
+
+# The parsers supported by the stream converter
+STREAM_FEATURES = ("lxml", "html.parser")
+
+# The size of the chunks of HTML fed at once to the parser
+CHUNK_SIZE = 64 * 1024
+
+# The characters beautifulsoup4 considers as (collapsible) whitespaces
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+# The tags in which beautifulsoup4 doesn't collapse whitespaces
+PRESERVE_WHITESPACE_TAGS = ("pre", "textarea")
+
+# The HTML tags that never have an end tag
+VOID_TAGS = frozenset(
+    (
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "keygen",
+        "link",
+        "menuitem",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+        "basefont",
+        "bgsound",
+        "command",
+        "frame",
+        "image",
+        "isindex",
+        "nextid",
+        "spacer",
+    )
+)
+
+# The kind of the opened elements that are ignored, along with their children
+_SKIP = -1
+
+# A parsed tag, which exposes the same interface as a bs4 tag
+# to the handlers of the converter (``name`` and ``attrs``).
+StreamNode = namedtuple("StreamNode", ["name", "attrs"])
+
+# An opened element, it only lives until its end tag is received.
+# Its kind is either the kind of its tag or ``_SKIP``.
+_Frame = namedtuple("_Frame", ["kind", "node", "block", "start_pos", "preserve"])
+
+
+class _LxmlTarget(object):
+    """Forwards the events of a lxml parser to a stream converter."""
+
+    def __init__(self, converter):
+        self.converter = converter
+
+    def start(self, tag, attrib, nsmap=None):
+        self.converter.handle_starttag(tag, attrib)
+
+    def end(self, tag):
+        self.converter.handle_endtag(tag)
+
+    def data(self, data):
+        self.converter.handle_data(data)
+
+    def comment(self, data):
+        self.converter.handle_comment(data)
+
+    def pi(self, target, data):
+        self.converter.handle_comment(target + " " + data)
+
+    def close(self):
+        self.converter.handle_close()
+
+
+class _HTMLParserTarget(HTMLParser):
+    """
+    Forwards the events of the standard library HTML parser to a stream converter.
+
+    Like beautifulsoup4, void tags are closed as soon as they are opened
+    and end tags that were never opened are ignored.
+    """
+
+    def __init__(self, converter):
+        super().__init__(convert_charrefs=True)
+        self.converter = converter
+        self.open_tags = []
+
+    def handle_starttag(self, tag, attrs):
+        self.converter.handle_starttag(tag, dict(attrs))
+
+        if tag in VOID_TAGS:
+            self.converter.handle_endtag(tag)
+        else:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.converter.handle_starttag(tag, dict(attrs))
+        self.converter.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag not in self.open_tags:
+            return
+
+        # Close every tag left opened up to the matching one
+        while self.open_tags:
+            opened_tag = self.open_tags.pop()
+            self.converter.handle_endtag(opened_tag)
+            if opened_tag == tag:
+                break
+
+    def handle_data(self, data):
+        self.converter.handle_data(data)
+
+    def handle_comment(self, data):
+        self.converter.handle_comment(data)
+
+    def close(self):
+        super().close()
+        while self.open_tags:
+            self.converter.handle_endtag(self.open_tags.pop())
+        self.converter.handle_close()
+
+
+class PushSession(object):
+    """
+    Converts HTML pushed chunk by chunk, e.g. as it is received from the network,
+    returning the Draft JS blocks as soon as their tag is closed.
+
+    Created by :meth:`StreamConverter.new_push_session`.
+
+    :param session: The incremental session of a stream converter.
+    :type session: StreamConverter
+
+    :param features: The parser to use, either ``lxml`` or ``html.parser``.
+    :type features: str
+
+    :param encoding: The encoding of the chunks passed as bytes.
+    :type encoding: str
+    """
+
+    def __init__(self, session, features="lxml", encoding="utf-8"):
+        self.session = session
+        self.parser = session.create_parser(features)
+        self.decoder = codecs.getincrementaldecoder(encoding)("replace")
+        self.closed = False
+
+        # Whether a chunk was fed, lxml failing to close a parser which was never fed
+        self.fed = False
+
+        # Whether the conversion stopped, having exceeded its budget
+        self.stopped = False
+
+    def _check_open(self):
+        if self.closed:
+            raise ValueError("The push session is closed")
+
+    def feed(self, chunk):
+        """
+        Parses the next chunk of the HTML.
+
+        :param chunk:
+        :type chunk: Union[str, bytes]
+
+        :return: The blocks finished by the chunk, along with the entities
+            they are referencing (see :meth:`SoupConverter.iter_blocks`).
+        :rtype: List[Tuple[dict, dict]]
+        """
+        self._check_open()
+
+        if not isinstance(chunk, str):
+            chunk = self.decoder.decode(chunk)
+
+        self.fed = True
+        self._parse(self.parser.feed, self.session.limit_chunk(chunk))
+        return list(self.session.pop_finished_blocks())
+
+    def close(self):
+        """
+        Ends the HTML, closing the tags left opened.
+
+        :return: The last blocks, along with the entities they are referencing.
+        :rtype: List[Tuple[dict, dict]]
+        """
+        self._check_open()
+        self.closed = True
+
+        remaining = self.decoder.decode(b"", final=True)
+        if remaining or not self.fed:
+            self._parse(self.parser.feed, self.session.limit_chunk(remaining))
+
+        self._parse(self.parser.close)
+        return list(self.session.pop_finished_blocks())
+
+    def _parse(self, method, *args):
+        """Calls a method of the parser, unless the conversion stopped."""
+        if self.stopped:
+            return
+
+        try:
+            method(*args)
+        except _BudgetExhausted:
+            self.stopped = True
+            self.session.stop_conversion()
+
+
+class StreamConverter(SoupConverter):
+    """
+    Converts HTML to Draft JS's JSON format directly from the events of a parser,
+    without building a beautifulsoup4 tree.
+
+    It produces the same output than :class:`SoupConverter` would for the same
+    parser, while only keeping in memory the elements being currently opened.
+    """
+
+    def initialize_session_converter(self, incremental=False):
+        super().initialize_session_converter(incremental)
+
+        # The elements being currently opened inside the body
+        self._stack = []  # type: list
+
+        # The text data received since the last tag
+        self._pending_data = []  # type: list
+
+        # Whether the body was already converted
+        self._done = False
+
+        # The length of the HTML fed to the parser, and whether it was truncated
+        # to the ``max_bytes`` budget
+        self._fed_length = 0
+        self._truncated = False
+
+    def _flush_data(self):
+        """Appends the text received since the last tag to the current block."""
+        if not self._pending_data:
+            return
+
+        data = "".join(self._pending_data)
+        self._pending_data = []
+
+        if not self._stack:
+            return
+
+        frame = self._stack[-1]
+        if frame.kind == _SKIP:
+            return
+
+        if self._instrumentation is not None:
+            self._instrumentation.incr("nodes")
+        if self._budget is not None:
+            self.consume_node()
+
+        # Collapse the whitespaces the same way beautifulsoup4 does
+        if not frame.preserve and not data.strip(ASCII_SPACES):
+            data = "\n" if "\n" in data else " "
+
+        frame.block.text.append(data.strip("\n"))
+
+    def _open_block(self, node: StreamNode, parent: Optional[StreamNode], preserve):
+        block = self.open_block(node, parent)
+        self._push(_Frame(BLOCK_TAG, node, block, 0, preserve))
+
+    def _push(self, frame):
+        """Opens an element which isn't skipped."""
+        self._stack.append(frame)
+
+        if self._instrumentation is not None:
+            self._instrumentation.maximum("max_depth", len(self._stack))
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_data()
+
+        if self._done:
+            return
+
+        tag_name = tag.lower()
+        node = StreamNode(tag_name, attrs)
+        stack = self._stack
+
+        # Ignore everything until the body is reached
+        if not stack:
+            if tag_name == "body":
+                self._open_block(node, None, False)
+            return
+
+        parent = stack[-1]
+        preserve = parent.preserve or tag_name in PRESERVE_WHITESPACE_TAGS
+
+        # Ignore the children of skipped elements
+        if parent.kind == _SKIP:
+            stack.append(_Frame(_SKIP, node, None, 0, preserve))
+            return
+
+        if self._instrumentation is not None:
+            self._instrumentation.incr("nodes")
+        if self._budget is not None:
+            self.consume_node()
+
+        if self.max_depth is not None and len(stack) >= self.max_depth:
+            self.dispatch_error(
+                "Maximum nesting depth exceeded",
+                "max_depth",
+                self.max_depth,
+                tag_name,
+                error_class=BudgetExceededError,
+            )
+            stack.append(_Frame(_SKIP, node, None, 0, preserve))
+            return
+
+        tag_kind = self._tag_kinds.get(tag_name)
+
+        # If the node is a block, build a block
+        if tag_kind == BLOCK_TAG:
+            grand_parent = stack[-2].node if len(stack) > 1 else None
+
+            if grand_parent is not None and grand_parent.name in self._all_inline_tags:
+                self.dispatch_error(
+                    "Doesn't support blocks within a inline tag (invalid)",
+                    tag_name,
+                    node,
+                    grand_parent,
+                )
+                stack.append(_Frame(_SKIP, node, None, 0, preserve))
+                return
+
+            self._open_block(node, parent.node, preserve)
+            return
+
+        # Check if the node is a inline tag, then
+        if tag_kind is None and tag_name:
+            self.dispatch_error("Unsupported tag in block", tag_name, node)
+            stack.append(_Frame(_SKIP, node, None, 0, preserve))
+            return
+
+        block = parent.block
+        self._push(_Frame(tag_kind, node, block, len(block.text), preserve))
+
+    def handle_endtag(self, tag):
+        self._flush_data()
+
+        if not self._stack:
+            return
+
+        frame = self._stack.pop()
+        if not self._stack:
+            self._done = True
+
+        kind, node, block, start_pos, _ = frame
+
+        if kind == BLOCK_TAG:
+            self.finish_block(block)
+        elif kind == ENTITY_TAG:
+            length = len(block.text) - start_pos
+
+            if self._instrumentation is None:
+                self.build_entity(node, block, start_pos, length)
+            else:
+                with self._instrumentation.phase("entities"):
+                    self.build_entity(node, block, start_pos, length)
+        elif kind == TEXT_TAG:
+            self.handle_text_tag(node, block)
+        elif kind != _SKIP:
+            length = len(block.text) - start_pos
+            self.handle_inline(node, block, start_pos, length)
+
+    def handle_data(self, data):
+        self._pending_data.append(data)
+
+    def handle_comment(self, data):
+        # beautifulsoup4 stores comments as strings of their own
+        self._flush_data()
+        self._pending_data.append(data)
+        self._flush_data()
+
+    def handle_close(self):
+        self._flush_data()
+
+    def create_parser(self, features):
+        """
+        Creates the parser that will be sending its events to the converter session.
+
+        :param features: The parser to use, either ``lxml`` or ``html.parser``.
+        :type features: str
+        """
+        if features == "lxml":
+            from lxml import etree
+
+            return etree.HTMLParser(target=_LxmlTarget(self))
+
+        if features == "html.parser":
+            return _HTMLParserTarget(self)
+
+        raise ValueError("Unsupported parser for streaming", features)
+
+    def convert(self, html, features="lxml", instrumentation=None, diagnostics=None):
+        """
+        Parses and converts the passed HTML into a standard Draft JS JSON format
+        as a python dictionary.
+
+        :param html:
+        :type html: str
+
+        :param features: The parser to use, either ``lxml`` or ``html.parser``.
+        :type features: str
+
+        :param instrumentation: Records the timings and counters of the conversion,
+            the parsing being part of the ``walk`` phase.
+        :type instrumentation: Optional[Instrumentation]
+
+        :param diagnostics: Collects the errors instead of generating warnings.
+        :type diagnostics: Optional[Diagnostics]
+
+        :return: The conversion session holding the result.
+        :rtype: StreamConverter
+        """
+        return self.convert_chunks((html,), features, instrumentation, diagnostics)
+
+    def convert_chunks(
+        self, chunks, features="lxml", instrumentation=None, diagnostics=None
+    ):
+        """
+        Parses and converts the passed pieces of HTML, as they are iterated,
+        into a standard Draft JS JSON format as a python dictionary.
+
+        :param chunks: The consecutive pieces of the HTML.
+        :type chunks: Iterable[str]
+
+        :param features: The parser to use, either ``lxml`` or ``html.parser``.
+        :type features: str
+
+        :param instrumentation: Records the timings and counters of the conversion,
+            the parsing being part of the ``walk`` phase.
+        :type instrumentation: Optional[Instrumentation]
+
+        :param diagnostics: Collects the errors instead of generating warnings.
+        :type diagnostics: Optional[Diagnostics]
+
+        :return: The conversion session holding the result.
+        :rtype: StreamConverter
+        """
+        session = self.new_session(
+            instrumentation=instrumentation, diagnostics=diagnostics
+        )
+
+        parser = session.create_parser(features)
+
+        try:
+            if instrumentation is None:
+                session.parse_chunks(parser, chunks)
+            else:
+                with instrumentation.phase("walk"):
+                    session.parse_chunks(parser, chunks)
+        except _BudgetExhausted:
+            session.stop_conversion()
+
+        return session
+
+    def parse_chunks(self, parser, chunks):
+        """
+        Feeds the pieces of the HTML to the parser of the session, truncating
+        them to the ``max_bytes`` budget of the session.
+        """
+        for chunk in chunks:
+            parser.feed(self.limit_chunk(chunk))
+            if self._truncated:
+                break
+
+        parser.close()
+
+    def limit_chunk(self, chunk):
+        """
+        :return: The next piece of the HTML, truncated to the ``max_bytes`` budget
+            of the session, empty once the budget was exceeded.
+        :rtype: str
+        """
+        budget = self._budget
+        if budget is None or budget.max_bytes is None:
+            return chunk
+
+        if self._truncated:
+            return ""
+
+        remaining = budget.max_bytes - self._fed_length
+        self._fed_length += len(chunk)
+        if len(chunk) <= remaining:
+            return chunk
+
+        self._truncated = True
+        self.dispatch_error(
+            "Conversion budget exceeded",
+            "max_bytes",
+            budget.max_bytes,
+            error_class=BudgetExceededError,
+        )
+        return chunk[:remaining]
+
+    def iter_blocks(self, html, features="lxml"):
+        """
+        Parses the passed HTML by chunks and yields the Draft JS blocks as soon as
+        their tag is closed (see :meth:`SoupConverter.iter_blocks`).
+
+        :param html:
+        :type html: str
+
+        :param features: The parser to use, either ``lxml`` or ``html.parser``.
+        :type features: str
+
+        :return: The finished blocks, along with the entities they are referencing.
+        :rtype: Iterator[Tuple[dict, dict]]
+        """
+        session = self.new_session(incremental=True)
+        html = session.limit_input(html)
+
+        parser = session.create_parser(features)
+        try:
+            # lxml fails to close a parser which was never fed
+            for start in range(0, len(html) or 1, CHUNK_SIZE):
+                end = start + CHUNK_SIZE
+                parser.feed(html[start:end])
+                yield from session.pop_finished_blocks()
+
+            parser.close()
+        except _BudgetExhausted:
+            session.stop_conversion()
+
+        yield from session.pop_finished_blocks()
+
+    def new_push_session(self, features="lxml", encoding="utf-8"):
+        """
+        Creates a session converting HTML pushed chunk by chunk, see
+        :class:`PushSession`.
+
+        :param features: The parser to use, either ``lxml`` or ``html.parser``.
+        :type features: str
+
+        :param encoding: The encoding of the chunks passed as bytes.
+        :type encoding: str
+
+        :rtype: PushSession
+        """
+        return PushSession(self.new_session(incremental=True), features, encoding)
@@ -45,6 +45,7 @@ setup(
         "Topic :: Software Development :: Libraries :: Python Modules",
     ],
     install_requires=REQUIREMENTS,
-    extras_require={"dev": DEV_REQUIREMENTS},
+    extras_require={"dev": DEV_REQUIREMENTS, "orjson": ["orjson"]},
+    entry_points={"console_scripts": ["html-to-draftjs = html_to_draftjs.cli:main"]},
     zip_safe=False,
 )
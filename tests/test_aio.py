@@ -0,0 +1,174 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from html_to_draftjs import (
+    aio,
+    html_to_draftjs,
+    html_to_draftjs_async,
+    html_to_draftjs_many_async,
+)
+
+HTML = "<h1>Title</h1><p>Some <b>text</b> <a href='/a'>link</a></p>"
+LONG_HTML = "<p>paragraph <b>bold</b></p>" * 5000
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def collect(results):
+    collected = []
+    async for result in results:
+        collected.append(result)
+    return collected
+
+
+class AsyncDocuments(object):
+    """Iterates the documents asynchronously, keeping track of the ones read."""
+
+    def __init__(self, documents):
+        self.documents = iter(documents)
+        self.read = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(0)
+        try:
+            html = next(self.documents)
+        except StopIteration:
+            raise StopAsyncIteration
+        self.read += 1
+        return html
+
+
+@pytest.mark.parametrize("features", ("lxml", "html.parser", "html5lib"))
+def test_html_to_draftjs_async(features):
+    """Tests converting HTML without blocking the event loop."""
+    html = "<html><body>{}</body></html>".format(HTML)
+    assert run(html_to_draftjs_async(html, features)) == html_to_draftjs(html, features)
+
+
+@pytest.mark.parametrize("executor_class", (ThreadPoolExecutor, ProcessPoolExecutor))
+def test_html_to_draftjs_async_executor(executor_class):
+    """Tests converting HTML in a given executor."""
+    with executor_class(2) as executor:
+        result = run(html_to_draftjs_async(HTML, executor=executor))
+        assert result == html_to_draftjs(HTML)
+
+        with pytest.raises(ValueError, match="Unsupported tag"):
+            run(
+                html_to_draftjs_async("<p><x>a</x></p>", strict=True, executor=executor)
+            )
+
+
+def test_html_to_draftjs_async_semaphore():
+    """Tests the conversions wait for the semaphore."""
+
+    async def convert():
+        semaphore = asyncio.Semaphore(1)
+        async with semaphore:
+            task = asyncio.ensure_future(
+                html_to_draftjs_async(HTML, semaphore=semaphore)
+            )
+            await asyncio.sleep(0.05)
+            assert not task.done()
+        return await task
+
+    assert run(convert()) == html_to_draftjs(HTML)
+
+
+def test_html_to_draftjs_async_cancelled():
+    """Tests a cancelled conversion is stopped between two blocks."""
+    cancelled = threading.Event()
+    cancelled.set()
+    with pytest.raises(aio._ConversionCancelled):
+        aio._convert(LONG_HTML, "lxml", False, cancelled)
+
+    async def cancel():
+        task = asyncio.ensure_future(html_to_draftjs_async(LONG_HTML))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        run(cancel())
+
+
+@pytest.mark.parametrize("ordered", (True, False))
+def test_html_to_draftjs_many_async(ordered):
+    """Tests converting documents, capturing their errors."""
+    documents = [HTML, "<p><x>a</x></p>", "<p>last</p>"]
+
+    results = run(
+        collect(html_to_draftjs_many_async(documents, strict=True, ordered=ordered))
+    )
+    if not ordered:
+        results.sort()
+
+    assert [result.index for result in results] == [0, 1, 2]
+    assert results[0].result == html_to_draftjs(HTML)
+    assert isinstance(results[1].error, ValueError)
+    assert results[2].result == html_to_draftjs("<p>last</p>")
+
+
+def test_html_to_draftjs_many_async_backpressure():
+    """Tests the documents are consumed as the results are consumed."""
+    documents = AsyncDocuments("<p>{}</p>".format(i) for i in range(20))
+
+    async def consume():
+        results = html_to_draftjs_many_async(documents, concurrency=2)
+        first = await results.__anext__()
+        assert documents.read <= 4
+        rest = await collect(results)
+        return [first] + rest
+
+    results = run(consume())
+    assert [result.result["blocks"][0]["text"] for result in results] == [
+        str(i) for i in range(20)
+    ]
+
+
+def test_html_to_draftjs_many_async_slow_document():
+    """
+    Tests the next documents are converted while waiting for the result of
+    a slower document, their results being kept in order.
+    """
+    documents = AsyncDocuments([LONG_HTML * 4] + [HTML] * 9)
+
+    async def consume():
+        results = html_to_draftjs_many_async(documents, concurrency=2)
+        first = await results.__anext__()
+        assert documents.read == 4
+        rest = await collect(results)
+        return [first] + rest
+
+    results = run(consume())
+    assert [result.index for result in results] == list(range(10))
+    assert results[-1].result == html_to_draftjs(HTML)
+
+
+def test_html_to_draftjs_many_async_close():
+    """Tests closing the results cancels the pending conversions."""
+    documents = AsyncDocuments([HTML] + [LONG_HTML] * 10)
+
+    async def consume():
+        results = html_to_draftjs_many_async(documents, concurrency=3)
+        assert (await results.__anext__()).result == html_to_draftjs(HTML)
+        pending = list(results.pending)
+        await results.aclose()
+
+        await asyncio.wait(pending)
+        assert all(task.cancelled() for task in pending)
+        assert await collect(results) == []
+
+    run(consume())
+    assert documents.read == 4
@@ -0,0 +1,66 @@
+import itertools
+
+import pytest
+
+from html_to_draftjs import html_to_draftjs, html_to_draftjs_many
+from html_to_draftjs.batch import PREFETCH_CHUNKS
+
+DOCUMENTS = ["<p>document {}</p>".format(i) for i in range(50)]
+
+
+@pytest.mark.parametrize("workers", (0, 2))
+def test_convert_many_ordered(workers):
+    """Tests the results are yielded in the order of the documents."""
+    results = list(html_to_draftjs_many(iter(DOCUMENTS), workers=workers, chunksize=4))
+
+    assert [result.index for result in results] == list(range(len(DOCUMENTS)))
+    assert [result.result for result in results] == [
+        html_to_draftjs(html) for html in DOCUMENTS
+    ]
+    assert all(result.error is None for result in results)
+
+
+def test_convert_many_unordered():
+    """Tests all the documents are converted when the order doesn't matter."""
+    results = html_to_draftjs_many(DOCUMENTS, workers=2, chunksize=4, ordered=False)
+    results = sorted(results, key=lambda result: result.index)
+
+    assert [result.result for result in results] == [
+        html_to_draftjs(html) for html in DOCUMENTS
+    ]
+
+
+@pytest.mark.parametrize("workers", (0, 2))
+def test_convert_many_captures_errors(workers):
+    """Tests an invalid document doesn't abort the batch."""
+    documents = ["<p>valid</p>", "<p><span>invalid</span></p>", "<p>valid</p>"]
+    results = list(html_to_draftjs_many(documents, workers=workers, strict=True))
+
+    assert [result.error is None for result in results] == [True, False, True]
+    assert isinstance(results[1].error, ValueError)
+    assert results[1].error.args[:2] == ("Unsupported tag in block", "span")
+    assert results[1].result is None
+    assert results[2].result == html_to_draftjs("<p>valid</p>")
+
+
+def test_convert_many_lazily():
+    """
+    Tests the documents are submitted as the results are consumed, and that
+    the batch can be closed before all the documents are converted.
+    """
+    consumed = []
+
+    def documents():
+        for i in itertools.count():
+            consumed.append(i)
+            yield "<p>document {}</p>".format(i)
+
+    results = html_to_draftjs_many(documents(), workers=2, chunksize=4)
+    limit = 2 * 4 * PREFETCH_CHUNKS
+
+    for index, result in enumerate(itertools.islice(results, limit * 3)):
+        assert result.index == index
+        assert len(consumed) <= limit + index
+
+    results.close()
+    assert len(consumed) <= limit * 4
@@ -0,0 +1,65 @@
+import sys
+
+import pytest
+
+from benchmarks.corpora import CORPORA
+from benchmarks.imports import import_times, imported_modules, lazy_imports
+from benchmarks.suite import compare, run
+from html_to_draftjs import html_to_draftjs
+
+
+@pytest.mark.parametrize("name", sorted(CORPORA))
+def test_corpora_are_convertible(name):
+    """Tests the corpora generate blocks for every parser backend."""
+    html = CORPORA[name](2)
+
+    for features in ("lxml", "html.parser", "html5lib"):
+        assert html_to_draftjs(html, features, strict=True)["blocks"]
+
+
+def test_compare_runs():
+    """Tests the regressions are detected when comparing two runs."""
+    baseline = run(size=2, repeat=1, corpora=["huge_block"], features=["lxml"])
+    measures = baseline["results"]["huge_block"]["lxml"]
+    assert measures["blocks"] == 1
+    assert measures["peak_memory"] > 0
+
+    current = {
+        "results": {
+            "huge_block": {
+                "lxml": dict(measures, html_to_draftjs=measures["html_to_draftjs"] * 2)
+            }
+        }
+    }
+    regressions = [
+        comparison[2] for comparison in compare(baseline, current) if comparison[-1]
+    ]
+    assert regressions == ["html_to_draftjs"]
+
+
+def test_import_is_lazy():
+    """Tests importing the package doesn't import the parsers and asyncio."""
+    modules = imported_modules()
+    assert "html_to_draftjs" in modules
+    assert lazy_imports(modules) == []
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="-X importtime needs 3.7")
+def test_import_times():
+    """Tests the import times are measured, without the lazy modules."""
+    times = import_times()
+    assert times["html_to_draftjs"][1] > 0
+    assert lazy_imports(times) == []
+
+
+@pytest.mark.parametrize(
+    "code,imported",
+    (
+        ("html_to_draftjs('<p>a</p>')", ["lxml"]),
+        ("html_to_draftjs_stream('<p>a</p>', 'html.parser')", []),
+    ),
+)
+def test_conversion_imports(code, imported):
+    """Tests the conversions only import the parsers they use."""
+    modules = imported_modules("from html_to_draftjs import *; " + code)
+    assert lazy_imports(modules) == imported
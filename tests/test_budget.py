@@ -0,0 +1,142 @@
+import time
+
+import bs4
+import pytest
+
+from html_to_draftjs import (
+    Budget,
+    BudgetExceededError,
+    Diagnostics,
+    Instrumentation,
+    html_to_draftjs,
+)
+from html_to_draftjs.converter import SoupConverter
+from html_to_draftjs.lxml_tree import LxmlConverter
+from html_to_draftjs.stream import StreamConverter
+
+HTML = "<html><body>{}</body></html>".format(
+    "<p>text <a href='/link'>link</a></p>" * 20
+)
+LONG_HTML = "<html><body>{}</body></html>".format("<p>text <b>bold</b></p>" * 2000)
+
+
+@pytest.fixture(params=(("lxml", None), ("lxml", "bs4"), ("html.parser", None)))
+def conversion(request):
+    features, backend = request.param
+
+    def convert(html, **kwargs):
+        return html_to_draftjs(html, features, backend=backend, **kwargs)
+
+    return convert
+
+
+@pytest.mark.parametrize(
+    "budget,name,blocks,entities",
+    (
+        (Budget(max_nodes=10), "max_nodes", 3, 2),
+        (Budget(max_blocks=5), "max_blocks", 5, 5),
+        (Budget(max_entities=3), "max_entities", 4, 3),
+        (Budget(max_bytes=150), "max_bytes", 4, 4),
+    ),
+)
+def test_budget(conversion, budget, name, blocks, entities):
+    """Tests the conversions exceeding a budget are truncated or raise an error."""
+    diagnostics = Diagnostics()
+    result = conversion(HTML, budget=budget, diagnostics=diagnostics)
+
+    assert len(result["blocks"]) == blocks
+    assert len(result["entityMap"]) == entities
+    assert [(error.message, error.args[0]) for error in diagnostics.records] == [
+        ("Conversion budget exceeded", name)
+    ]
+
+    with pytest.raises(BudgetExceededError) as exc_info:
+        conversion(HTML, strict=True, budget=budget)
+    assert exc_info.value.budget == name
+    assert exc_info.value.limit == getattr(budget, name)
+
+
+def test_budget_unlimited(conversion):
+    """Tests the conversions within their budget are not changed."""
+    budget = Budget(
+        max_bytes=len(HTML), max_nodes=100, max_blocks=20, max_entities=20, timeout=60
+    )
+    assert conversion(HTML, strict=True, budget=budget) == html_to_draftjs(HTML)
+
+
+def test_budget_max_depth(conversion):
+    """Tests the elements deeper than the maximum depth are skipped."""
+    html = "<html><body><p>text <b>bold <i>italic</i></b></p></body></html>"
+    with pytest.warns(UserWarning, match="Maximum nesting depth exceeded"):
+        result = conversion(html, budget=Budget(max_depth=3))
+    assert [block["text"] for block in result["blocks"]] == ["text bold "]
+
+    with pytest.raises(BudgetExceededError) as exc_info:
+        conversion(html, strict=True, budget=Budget(max_depth=3))
+    assert (exc_info.value.budget, exc_info.value.limit) == ("max_depth", 3)
+
+
+def test_budget_timeout(conversion):
+    """Tests the conversions exceeding their deadline stop walking the elements."""
+    with pytest.warns(UserWarning, match="Conversion budget exceeded"):
+        result = conversion(LONG_HTML, budget=Budget(timeout=0))
+    assert 0 < len(result["blocks"]) < 2000
+
+    with pytest.raises(BudgetExceededError, match="timeout"):
+        conversion(LONG_HTML, strict=True, budget=Budget(timeout=0))
+
+
+def test_budget_timeout_includes_parsing(conversion, monkeypatch):
+    """Tests the deadline of a conversion starts before parsing the HTML."""
+    lxml_parse = LxmlConverter.parse
+
+    class SlowSoup(bs4.BeautifulSoup):
+        def __init__(self, *args, **kwargs):
+            time.sleep(0.3)
+            super().__init__(*args, **kwargs)
+
+    def slow_parse(*args, **kwargs):
+        time.sleep(0.3)
+        return lxml_parse(*args, **kwargs)
+
+    monkeypatch.setattr(bs4, "BeautifulSoup", SlowSoup)
+    monkeypatch.setattr(LxmlConverter, "parse", staticmethod(slow_parse))
+
+    with pytest.warns(UserWarning, match="Conversion budget exceeded"):
+        result = conversion(LONG_HTML, budget=Budget(timeout=0.2))
+    assert len(result["blocks"]) < 100
+
+
+def test_budget_max_bytes_instrumentation(conversion):
+    """Tests the input exceeding its budget is counted by the instrumentation."""
+    instrumentation = Instrumentation()
+    with pytest.warns(UserWarning, match="Conversion budget exceeded"):
+        conversion(HTML, instrumentation=instrumentation, budget=Budget(max_bytes=150))
+    assert instrumentation.counters["warnings"] == 1
+
+
+def test_converter_budget():
+    """Tests the budget of a converter applies to all its conversions."""
+    budget = Budget(max_blocks=2)
+
+    converter = SoupConverter(budget=budget)
+    session = converter.new_session()
+    assert session._budget is budget
+    assert converter.new_session(budget=Budget())._budget is not budget
+
+    with pytest.warns(UserWarning, match="Conversion budget exceeded"):
+        result = StreamConverter(budget=budget).convert(HTML).to_dict()
+    assert len(result["blocks"]) == 2
+
+
+@pytest.mark.parametrize("features", ("lxml", "html.parser"))
+def test_budget_push(features):
+    """Tests a push session stops once its budget was exceeded."""
+    push = StreamConverter(budget=Budget(max_blocks=3)).new_push_session(features)
+
+    with pytest.warns(UserWarning, match="Conversion budget exceeded"):
+        blocks = push.feed(HTML)
+    assert push.stopped
+    assert len(blocks) == 3
+    assert push.feed("<p>ignored</p>") == []
+    assert push.close() == []
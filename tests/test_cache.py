@@ -0,0 +1,128 @@
+import pytest
+
+from html_to_draftjs import (
+    ConversionCache,
+    DiskBackend,
+    MemoryBackend,
+    html_to_draftjs,
+    types,
+)
+from html_to_draftjs.cache import converter_fingerprint
+from html_to_draftjs.converter import SoupConverter
+
+HTML = "<p>Hello <b>world</b> <a href='#'>link</a></p>"
+
+
+@pytest.fixture(params=("memory", "disk"))
+def cache(request, tmpdir):
+    if request.param == "memory":
+        return ConversionCache()
+    return ConversionCache(DiskBackend(str(tmpdir)))
+
+
+def test_cache_hit(cache):
+    """Tests the results are cached and every hit returns a new copy."""
+    expected = html_to_draftjs(HTML)
+
+    first = html_to_draftjs(HTML, cache=cache)
+    assert first == expected
+    assert cache.stats() == {"hits": 0, "misses": 1, "entries": 1}
+
+    first["blocks"][0]["text"] = "corrupted"
+    first["entityMap"].clear()
+
+    second = html_to_draftjs(HTML, cache=cache)
+    assert second == expected
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    second["blocks"].clear()
+    assert html_to_draftjs(HTML, cache=cache) == expected
+
+
+def test_cache_key(cache):
+    """Tests the options of the conversion are part of the key."""
+    html_to_draftjs(HTML, cache=cache)
+    html_to_draftjs(HTML, features="html.parser", cache=cache)
+    html_to_draftjs(HTML, strict=True, cache=cache)
+    html_to_draftjs(HTML + " ", cache=cache)
+    assert cache.stats() == {"hits": 0, "misses": 4, "entries": 4}
+
+
+def test_converter_fingerprint():
+    """Tests the fingerprint depends on the configuration of the converter."""
+    default = converter_fingerprint(SoupConverter())
+    assert converter_fingerprint(SoupConverter(strict=True)) == default
+    assert converter_fingerprint(SoupConverter(max_depth=3)) != default
+    assert converter_fingerprint(SoupConverter(inlines={"u": "UNDERLINE"})) != default
+
+    entities = dict(types.ENTITIES)
+    entities["a"] = types.ENTITY_TYPE(
+        type="LINK", attributes={"href": {"name": "href"}}
+    )
+    assert converter_fingerprint(SoupConverter(entities=entities)) != default
+
+
+def test_memory_backend_eviction():
+    """Tests the least recently used results are evicted first."""
+    backend = MemoryBackend(max_entries=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    assert backend.get("a") == "1"
+
+    backend.set("c", "3")
+    assert backend.get("b") is None
+    assert backend.get("a") == "1"
+    assert backend.get("c") == "3"
+
+    backend = MemoryBackend(max_entries=None, max_bytes=5)
+    backend.set("a", "123")
+    backend.set("b", "45")
+    assert backend.size == 5
+
+    backend.set("c", "6")
+    assert backend.get("a") is None
+    assert backend.size == 3
+    assert len(backend) == 2
+
+
+def test_disk_backend_eviction(tmpdir):
+    """Tests the disk backend removes the oldest results."""
+    backend = DiskBackend(str(tmpdir), max_entries=2)
+    for key in "abc":
+        backend.set(key, key)
+        (tmpdir / key + ".json").setmtime(ord(key))
+
+    backend.set("d", "d")
+    assert len(backend) == 2
+    assert backend.get("a") is None
+    assert backend.get("d") == "d"
+
+    backend.clear()
+    assert len(backend) == 0
+
+
+def test_disk_backend_counts_entries(tmpdir, monkeypatch):
+    """Tests the disk backend only scans its directory every so many writes."""
+    backend = DiskBackend(str(tmpdir), max_entries=50)
+    scans = []
+    list_entries = backend._list
+
+    def record_scan():
+        scans.append(None)
+        return list_entries()
+
+    monkeypatch.setattr(backend, "_list", record_scan)
+
+    for i in range(100):
+        backend.set(str(i), "value")
+        (tmpdir / str(i) + ".json").setmtime(i)
+
+    # Scanned every 5 writes, or once full, the oldest results being removed at once
+    assert len(scans) <= 30
+    assert 45 <= len(backend) == len(tmpdir.listdir()) <= 50
+    assert backend.get("0") is None
+    assert backend.get("99") == "value"
+
+    scanned = len(scans)
+    assert ConversionCache(backend).stats()["entries"] == len(backend)
+    assert len(scans) == scanned
@@ -0,0 +1,85 @@
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from html_to_draftjs import html_to_draftjs
+from html_to_draftjs.cli import main
+
+HTML = "<p>Some <a href='/a'>link</a></p>"
+
+
+def read_records(output):
+    return [json.loads(line) for line in output.splitlines()]
+
+
+@pytest.mark.parametrize("workers", ("0", "2"))
+def test_convert_directory(tmpdir, capsys, workers):
+    """Tests converting the HTML files of a directory, in their order."""
+    tmpdir.join("a.html").write(HTML)
+    tmpdir.mkdir("sub").join("b.htm").write("<p>b</p>")
+    tmpdir.join("ignored.txt").write("<p>ignored</p>")
+
+    assert main([str(tmpdir), "--workers", workers]) == 0
+
+    output, summary = capsys.readouterr()
+    assert read_records(output) == [
+        {"id": str(tmpdir.join("a.html")), "result": html_to_draftjs(HTML)},
+        {"id": str(tmpdir.join("sub", "b.htm")), "result": html_to_draftjs("<p>b</p>")},
+    ]
+    assert summary.startswith("2 documents (0 errors)")
+
+
+def test_convert_errors(tmpdir, capsys):
+    """Tests the documents which failed are reported without stopping."""
+    path = tmpdir.join("a.html")
+    path.write("<p><x>unsupported</x></p>")
+    missing = str(tmpdir.join("missing.html"))
+
+    assert main([str(path), missing, "--strict", "--workers", "0"]) == 1
+
+    output, summary = capsys.readouterr()
+    errors = [record["error"]["type"] for record in read_records(output)]
+    assert errors == ["ValueError", "FileNotFoundError"]
+    assert summary.startswith("2 documents (2 errors)")
+
+
+def test_convert_stdin(monkeypatch, capsys):
+    """Tests converting newline-delimited JSON records read from stdin."""
+    lines = [
+        json.dumps({"id": "first", "html": HTML}),
+        json.dumps("<p>second</p>"),
+        "",
+        "not json",
+        json.dumps({"id": "no html"}),
+    ]
+    monkeypatch.setattr(sys, "stdin", io.StringIO("\n".join(lines)))
+
+    assert main(["--workers", "0", "--features", "html.parser", "--quiet"]) == 1
+
+    output, summary = capsys.readouterr()
+    records = read_records(output)
+    assert summary == ""
+    assert records[:2] == [
+        {"id": "first", "result": html_to_draftjs(HTML, "html.parser")},
+        {"id": 2, "result": html_to_draftjs("<p>second</p>", "html.parser")},
+    ]
+    assert [(record["id"], record["error"]["type"]) for record in records[2:]] == [
+        (4, "JSONDecodeError"),
+        ("no html", "ValueError"),
+    ]
+
+
+def test_module():
+    """Tests the command line runs as ``python -m html_to_draftjs``."""
+    process = subprocess.run(
+        [sys.executable, "-m", "html_to_draftjs", "-w", "0"],
+        input=json.dumps(HTML),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    assert read_records(process.stdout) == [{"id": 1, "result": html_to_draftjs(HTML)}]
@@ -0,0 +1,78 @@
+import gc
+import warnings
+import weakref
+
+import bs4
+import pytest
+from lxml import etree
+
+from html_to_draftjs import (
+    Diagnostics,
+    html_to_draftjs,
+    html_to_draftjs_stream,
+    soup_to_draftjs,
+)
+
+
+@pytest.mark.parametrize("convert", (html_to_draftjs, html_to_draftjs_stream))
+def test_diagnostics(convert):
+    """Tests the errors are collected instead of generating warnings."""
+    html = "<p>{}<b></b></p>".format("<span>a</span><font>b</font>" * 3)
+    diagnostics = Diagnostics(limit=4)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", UserWarning)
+        json = convert(html, diagnostics=diagnostics)
+
+    assert json["blocks"] == []
+    assert diagnostics.counts == {
+        "Unsupported tag in block": 6,
+        "Inline styles cannot have empty inner": 1,
+    }
+    assert diagnostics.total == 7
+    assert diagnostics.dropped == 3
+    assert [str(record) for record in diagnostics.records] == [
+        "Unsupported tag in block: ('span', <span>)",
+        "Unsupported tag in block: ('font', <font>)",
+    ] * 2
+    assert diagnostics.as_dict()["dropped"] == 3
+
+
+def test_diagnostics_formatting():
+    """Tests the tags are formatted without their children."""
+    diagnostics = Diagnostics()
+    html_to_draftjs(
+        "<p><span title='a' id='b'>hello</span></p>", diagnostics=diagnostics
+    )
+
+    record = diagnostics.records[0]
+    assert record.message == "Unsupported tag in block"
+    assert str(record) == (
+        """Unsupported tag in block: ('span', <span title="a" id="b">)"""
+    )
+
+
+@pytest.mark.parametrize("backend", ("bs4", "lxml"))
+def test_diagnostics_snapshots(backend):
+    """Tests the errors don't reference the tags, keeping their tree alive."""
+    diagnostics = Diagnostics()
+    html = "<p><span title='a'>hello</span></p>"
+    html_to_draftjs(html, backend=backend, diagnostics=diagnostics)
+
+    name, tag = diagnostics.records[0].args
+    assert type(name) is str
+    assert not isinstance(tag, (bs4.Tag, etree._Element))
+    assert (tag.name, tag.attrs) == ("span", {"title": "a"})
+
+    soup = bs4.BeautifulSoup(html, "lxml")
+    soup_to_draftjs(soup, diagnostics=diagnostics)
+    reference = weakref.ref(soup)
+    del soup
+    gc.collect()
+    assert reference() is None
+
+
+def test_diagnostics_strict_mode():
+    """Tests the errors are still raised in strict mode."""
+    with pytest.raises(ValueError):
+        html_to_draftjs("<span>a</span>", strict=True, diagnostics=Diagnostics())
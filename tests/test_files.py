@@ -0,0 +1,171 @@
+import codecs
+import io
+
+import pytest
+
+from html_to_draftjs import files, html_file_to_draftjs, html_to_draftjs
+from html_to_draftjs.stream import CHUNK_SIZE, STREAM_FEATURES
+
+HTML = (
+    "<html><body><h1>Café ☃</h1><p>Héllo <b>wörld</b><a href='/a'>link</a></p>"
+    "<blockquote><p>quote</p></blockquote></body></html>"
+)
+
+
+@pytest.fixture(params=("lxml", "html.parser", "html5lib"))
+def features(request):
+    return request.param
+
+
+def test_bytes(features):
+    """Tests converting UTF-8 bytes."""
+    expected = html_to_draftjs(HTML, features)
+    assert html_file_to_draftjs(HTML.encode("utf-8"), features=features) == expected
+
+
+def test_path_and_file_object(features, tmp_path):
+    """Tests converting a file, from its path or opened."""
+    expected = html_to_draftjs(HTML, features)
+    path = tmp_path / "document.html"
+    path.write_bytes(HTML.encode("utf-8"))
+
+    assert html_file_to_draftjs(path, features=features) == expected
+    assert html_file_to_draftjs(str(path), features=features) == expected
+    with open(path, "rb") as fp:
+        assert html_file_to_draftjs(fp, features=features) == expected
+    assert html_file_to_draftjs(io.BytesIO(path.read_bytes()), features=features) == (
+        expected
+    )
+
+
+@pytest.mark.parametrize(
+    "bom, encoding",
+    (
+        (codecs.BOM_UTF8, "utf-8"),
+        (codecs.BOM_UTF16_LE, "utf-16-le"),
+        (codecs.BOM_UTF16_BE, "utf-16-be"),
+    ),
+)
+def test_byte_order_mark(features, bom, encoding):
+    """Tests the encoding is given by the byte order mark."""
+    expected = html_to_draftjs(HTML, features)
+    assert html_file_to_draftjs(bom + HTML.encode(encoding), features=features) == (
+        expected
+    )
+
+
+@pytest.mark.parametrize(
+    "meta",
+    (
+        "<meta charset='iso-8859-1'>",
+        '<meta http-equiv="Content-Type" content="text/html; charset=latin-1">',
+    ),
+)
+def test_meta_charset(meta):
+    """Tests the encoding is given by a meta tag."""
+    html = "<html><head>{}</head><body><p>Café</p></body></html>".format(meta)
+    result = html_file_to_draftjs(html.encode("iso-8859-1"))
+    assert [block["text"] for block in result["blocks"]] == ["Café"]
+
+
+def test_encoding(features):
+    """Tests passing the encoding, and falling back to windows-1252."""
+    html = "<html><body><p>Café “quoted”</p></body></html>"
+    data = html.encode("windows-1252")
+
+    expected = ["Café “quoted”"]
+    for encoding in ("windows-1252", None):
+        result = html_file_to_draftjs(data, encoding, features=features)
+        assert [block["text"] for block in result["blocks"]] == expected
+
+    assert files.sniff_encoding(data) == (None, 0)
+    assert files.decode_html(data) == files.decode_html(html.encode("utf-8")) == html
+
+
+def test_encoding_byte_order_mark(features):
+    """Tests the byte order mark of the passed encoding is skipped."""
+    html = "<html><body><p>Café</p></body></html>"
+    data = codecs.BOM_UTF8 + html.encode("utf-8")
+
+    assert files.sniff_encoding(data, "utf-8") == ("utf-8", 3)
+    assert files.sniff_encoding(data, "windows-1252") == ("windows-1252", 0)
+    assert files.decode_html(data, "utf-8") == html
+
+    result = html_file_to_draftjs(data, "utf-8", features=features)
+    assert [block["text"] for block in result["blocks"]] == ["Café"]
+
+
+def test_encoding_fallback_warnings(features):
+    """Tests the warnings are only emitted by the conversion which was kept."""
+    html = "<html><body><p><x>{}</x></p><p>Café</p></body></html>".format(
+        "a" * CHUNK_SIZE
+    )
+
+    with pytest.warns(UserWarning) as warnings:
+        result = html_file_to_draftjs(html.encode("windows-1252"), features=features)
+    assert [block["text"] for block in result["blocks"]][-1] == "Café"
+    assert len(warnings) == 1
+    assert str(warnings[0].message).startswith("Unsupported tag in block")
+
+
+def test_encoding_fallback_after_first_chunk(features, monkeypatch):
+    """
+    Tests the bytes are only decoded once when they are valid UTF-8, and
+    converted again as windows-1252 when a later chunk is not valid UTF-8.
+    """
+    decoded = []
+    iter_decoded_chunks = files.iter_decoded_chunks
+
+    def record_decoding(data, encoding, *args, **kwargs):
+        decoded.append(encoding)
+        return iter_decoded_chunks(data, encoding, *args, **kwargs)
+
+    monkeypatch.setattr("html_to_draftjs.iter_decoded_chunks", record_decoding)
+
+    html = "<html><body><p>Café</p></body></html>"
+    assert html_file_to_draftjs(html.encode("utf-8"), features=features) == (
+        html_to_draftjs(html, features)
+    )
+
+    html = "<html><body><p>{}</p><p>Café “quoted”</p></body></html>".format(
+        "a" * CHUNK_SIZE
+    )
+    result = html_file_to_draftjs(html.encode("windows-1252"), features=features)
+    assert result == html_to_draftjs(html, features)
+
+    if features in STREAM_FEATURES:
+        assert decoded == ["utf-8", "utf-8", "windows-1252"]
+
+
+def test_memory_map(tmp_path, monkeypatch):
+    """Tests the large files are memory-mapped and decoded by chunks."""
+    monkeypatch.setattr(files, "MMAP_THRESHOLD", 16)
+    mapped = []
+    mmap = files.mmap.mmap
+
+    def record_mmap(*args, **kwargs):
+        mapped.append(mmap(*args, **kwargs))
+        return mapped[-1]
+
+    monkeypatch.setattr(files.mmap, "mmap", record_mmap)
+
+    html = HTML * 50
+    path = tmp_path / "document.html"
+    path.write_bytes(html.encode("utf-8"))
+
+    # Split the multi-bytes characters between chunks
+    chunks = list(files.iter_decoded_chunks(html.encode("utf-8"), "utf-8", 0, 7))
+    assert "".join(chunks) == html
+
+    assert html_file_to_draftjs(path) == html_to_draftjs(html)
+    assert len(mapped) == 1 and mapped[0].closed
+
+
+def test_empty(features, tmp_path):
+    """Tests converting empty files."""
+    path = tmp_path / "empty.html"
+    path.write_bytes(b"")
+
+    expected = {"entityMap": {}, "blocks": []}
+    assert html_file_to_draftjs(path, features=features) == expected
+    assert html_file_to_draftjs(b"", features=features) == expected
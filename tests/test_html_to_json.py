@@ -1,19 +1,31 @@
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import bs4
 import pytest
 
-from html_to_draftjs import html_to_draftjs
+from html_to_draftjs import BACKENDS, Instrumentation, html_to_draftjs
+from html_to_draftjs.converter import SoupConverter
+from html_to_draftjs.lxml_tree import LxmlConverter
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    """The tree-building backends of the lxml parser, giving the same output."""
+    return request.param
 
 
-def test_convert_nothing():
+def test_convert_nothing(backend):
     """Tests converting empty HTML doesn't fail"""
     html = ""
-    json = html_to_draftjs(html)
+    json = html_to_draftjs(html, backend=backend)
     assert json == {"blocks": [], "entityMap": {}}
 
 
-def test_convert_block():
+def test_convert_block(backend):
     """Tests converting inline HTML contained into a block."""
     html = "<p>My content has <strong>some <em>content</em></strong></p>"
-    json = html_to_draftjs(html, strict=True)
+    json = html_to_draftjs(html, strict=True, backend=backend)
     assert json == {
         "entityMap": {},
         "blocks": [
@@ -33,14 +45,14 @@ def test_convert_block():
     }
 
 
-def test_convert_inline():
+def test_convert_inline(backend):
     """Tests converting ** HTML structure, where inline tags are not
     in a block tag."""
     html = (
         "My content has <strong>some <em>content</em></strong>"
         "<p>A paragraph here</p>"
     )
-    json = html_to_draftjs(html)
+    json = html_to_draftjs(html, backend=backend)
     assert json == {
         "entityMap": {},
         "blocks": [
@@ -199,9 +211,9 @@ def test_convert_inline():
         ),
     ),
 )
-def test_convert_image(html, expected):
+def test_convert_image(html, expected, backend):
     """Tests converting a image tag into JSON."""
-    json = html_to_draftjs(html, strict=True)
+    json = html_to_draftjs(html, strict=True, backend=backend)
     assert json == expected
 
 
@@ -212,9 +224,9 @@ def test_convert_image(html, expected):
         "<p>hello <a href='#my-link'>worl<strong>d</strong></a></p>",
     ),
 )
-def test_convert_link(html):
+def test_convert_link(html, backend):
     """Tests converting HTML links into JSON."""
-    json = html_to_draftjs(html, strict=True)
+    json = html_to_draftjs(html, strict=True, backend=backend)
     assert json == {
         "entityMap": {
             "0": {"type": "LINK", "mutability": "MUTABLE", "data": {"url": "#my-link"}}
@@ -240,9 +252,9 @@ def test_convert_link(html):
         ("<blockquote>My content</blockquote>", "blockquote"),
     ),
 )
-def test_convert_typed_block(html, expected_type):
+def test_convert_typed_block(html, expected_type, backend):
     """Tests converting HTML links into JSON."""
-    json = html_to_draftjs(html, strict=True)
+    json = html_to_draftjs(html, strict=True, backend=backend)
     assert json == {
         "entityMap": {},
         "blocks": [
@@ -266,9 +278,9 @@ def test_convert_typed_block(html, expected_type):
         ("<ol><li>a</li><li>b</li></ol>", "ordered-list-item"),
     ),
 )
-def test_convert_typed_block_list(html, expected_type):
+def test_convert_typed_block_list(html, expected_type, backend):
     """Tests converting HTML links into JSON."""
-    json = html_to_draftjs(html, strict=True)
+    json = html_to_draftjs(html, strict=True, backend=backend)
     assert json == {
         "entityMap": {},
         "blocks": [
@@ -294,9 +306,9 @@ def test_convert_typed_block_list(html, expected_type):
     }
 
 
-def test_convert_new_line_tags():
+def test_convert_new_line_tags(backend):
     """Tests converting HTML links into JSON."""
-    json = html_to_draftjs("<br><br/>", strict=True)
+    json = html_to_draftjs("<br><br/>", strict=True, backend=backend)
     assert json == {
         "entityMap": {},
         "blocks": [
@@ -313,7 +325,7 @@ def test_convert_new_line_tags():
     }
 
 
-def test_convert_page():
+def test_convert_page(backend):
     """Tests converting a full dummy HTML page into JSON.
 
     This covers all the cases, which are:
@@ -350,7 +362,7 @@ def test_convert_page():
         </ul>
     """
 
-    json = html_to_draftjs(html, strict=True)
+    json = html_to_draftjs(html, strict=True, backend=backend)
     assert json == {
         "entityMap": {},
         "blocks": [
@@ -437,3 +449,259 @@ def test_convert_page():
             },
         ],
     }
+
+
+def test_convert_many_inline_runs(backend):
+    """Tests the offsets of the inline styles in a long paragraph made of many runs."""
+    html = "<p>{}</p>".format("run <b>bold</b> " * 1000)
+    json = html_to_draftjs(html, strict=True, backend=backend)
+    block = json["blocks"][0]
+
+    assert block["text"] == "run bold " * 1000
+    assert block["inlineStyleRanges"] == [
+        {"offset": 9 * i + 4, "length": 4, "style": "BOLD"} for i in range(1000)
+    ]
+
+
+def test_convert_drops_empty_blocks():
+    """Tests empty blocks are dropped while keeping the order of the other blocks,
+    and no key is generated for them."""
+    html = "<div><p></p><p>a</p></div><p></p><div>b<p></p></div>"
+    keyed_blocks = []
+
+    def key_generator(block):
+        keyed_blocks.append(block["text"])
+        return str(len(keyed_blocks))
+
+    soup = bs4.BeautifulSoup(html, "lxml")
+    json = SoupConverter(key_generator=key_generator).convert(soup).to_dict()
+
+    assert [(block["key"], block["text"]) for block in json["blocks"]] == [
+        ("1", "a"),
+        ("2", "b"),
+    ]
+    assert keyed_blocks == ["a", "b"]
+
+
+def test_convert_deeply_nested_html():
+    """Tests converting deeply nested HTML doesn't hit the recursion limit."""
+    depth = 100000
+    html = "<body>{}x{}</body>".format("<div>" * depth, "</div>" * depth)
+    json = html_to_draftjs(html, features="html.parser", strict=True)
+    assert [block["text"] for block in json["blocks"]] == ["x"]
+
+
+@pytest.mark.parametrize("depth", (300, 2048, 100000))
+def test_convert_deeply_nested_html_lxml(depth, backend):
+    """Tests the elements nested deeper than the limits of libxml2 are kept."""
+    html = "{}x{}".format("<div>" * depth, "</div>" * depth)
+    json = html_to_draftjs(html, strict=True, backend=backend)
+    assert [block["text"] for block in json["blocks"]] == ["x"]
+
+
+@pytest.mark.parametrize("max_depth, expected_text", ((2, "a"), (3, "ab")))
+def test_convert_max_depth(max_depth, expected_text):
+    """Tests the elements deeper than the maximum depth are skipped."""
+    soup = bs4.BeautifulSoup("<p>a<b>b<i>c</i></b></p>", "lxml")
+
+    with pytest.warns(UserWarning, match="Maximum nesting depth exceeded"):
+        converter = SoupConverter(max_depth=max_depth).convert(soup)
+    assert converter.to_dict()["blocks"][0]["text"] == expected_text
+
+    converter = SoupConverter(max_depth=max_depth, strict=True)
+    with pytest.raises(ValueError, match="Maximum nesting depth exceeded"):
+        converter.convert(soup)
+
+
+def test_converter_shared_between_threads():
+    """Tests a converter can be used concurrently, each conversion
+    having its own session."""
+    converter = SoupConverter(strict=True)
+    soups = [
+        bs4.BeautifulSoup("<p>{0}<a href='{0}'>link</a></p>".format(i) * 20, "lxml")
+        for i in range(50)
+    ]
+    expected = [converter.convert(soup).to_dict() for soup in soups]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(lambda soup: converter.convert(soup).to_dict(), soups)
+        )
+
+    assert results == expected
+    assert converter._blocks is None
+
+
+@pytest.mark.parametrize("converter_class", (SoupConverter, LxmlConverter))
+def test_convert_memoized_blocks(converter_class):
+    """Tests the memoized blocks are converted the same way as the other blocks,
+    with their own keys and entities."""
+    section = (
+        "<div><h2>{}</h2><p>See <a href='/terms'>the <b>terms</b></a>"
+        "<img src='a.png'/></p><blockquote><p>quote</p>text</blockquote></div>"
+    )
+    html = "".join(section.format(i % 2) for i in range(6)) + "<p><b></b></p>" * 3
+
+    # The lxml converters parse the HTML themselves
+    document = html
+    if converter_class is SoupConverter:
+        document = bs4.BeautifulSoup(html, "lxml")
+
+    def convert(memoize_blocks):
+        keys = itertools.count()
+        converter = converter_class(
+            key_generator=lambda block: str(next(keys)),
+            memoize_blocks=memoize_blocks,
+        )
+        with pytest.warns(UserWarning) as warnings:
+            json = converter.convert(document).to_dict()
+        iterated = list(converter.iter_blocks(document))
+        return json, iterated, len(warnings)
+
+    expected = convert(False)
+    json, iterated, warning_count = convert(True)
+    assert (json, iterated, warning_count) == expected
+    assert [block["text"] for block in json["blocks"][:8:4]] == ["0", "1"]
+    assert len(json["entityMap"]) == 12
+    assert len({block["key"] for block in json["blocks"]}) == len(json["blocks"])
+
+    # The results don't share any data
+    json["blocks"][1]["entityRanges"][0]["key"] = 42
+    json["entityMap"]["0"]["data"]["url"] = "/changed"
+    assert json["blocks"][5]["entityRanges"][0]["key"] == 2
+    assert json["entityMap"]["2"]["data"]["url"] == "/terms"
+
+    # The repeated elements were replayed once they were recorded
+    instrumentation = Instrumentation()
+    converter = converter_class(memoize_blocks=True)
+    with pytest.warns(UserWarning):
+        converter.convert(document, instrumentation)
+    assert instrumentation.counters["memoized_blocks"] == 6
+
+
+def test_convert_memoized_lxml_elements():
+    """
+    Tests the lxml elements are told apart by the memo, their proxies being
+    created on access and their identifiers reused once they are collected.
+    """
+    html = "<body>{}</body>".format("<div><p>a</p></div><div><p>b</p></div>" * 3)
+
+    result = LxmlConverter(memoize_blocks=True).convert(html).to_dict()
+    assert [block["text"] for block in result["blocks"]] == ["a", "b"] * 3
+
+
+def test_convert_dedupe_entities():
+    """Tests the identical entities share the same key."""
+    soup = bs4.BeautifulSoup(
+        "<p><a href='/a'>a</a> <a href='/b'>b</a></p>"
+        "<p><a href='/a'>again</a><img src='/a'/></p>",
+        "lxml",
+    )
+
+    json = SoupConverter(dedupe_entities=True).convert(soup).to_dict()
+    assert json["entityMap"] == {
+        "0": {"type": "LINK", "mutability": "MUTABLE", "data": {"url": "/a"}},
+        "1": {"type": "LINK", "mutability": "MUTABLE", "data": {"url": "/b"}},
+        "2": {
+            "type": "IMAGE",
+            "mutability": "MUTABLE",
+            "data": {"src": "/a", "alt": "", "height": "initial", "width": "initial"},
+        },
+    }
+    assert [block["entityRanges"] for block in json["blocks"]] == [
+        [{"offset": 0, "length": 1, "key": 0}, {"offset": 2, "length": 1, "key": 1}],
+        [{"offset": 0, "length": 5, "key": 0}, {"offset": 5, "length": 0, "key": 2}],
+    ]
+
+    # The entities are yielded with every block referencing them
+    iterated = list(SoupConverter(dedupe_entities=True).iter_blocks(soup))
+    assert [list(entity_map) for _, entity_map in iterated] == [["0", "1"], ["0", "2"]]
+
+
+def test_convert_unsupported_backend():
+    """Tests the backend must be supported by the parser."""
+    with pytest.raises(ValueError, match="Unsupported backend"):
+        html_to_draftjs("<p>a</p>", backend="html5lib")
+
+    with pytest.raises(ValueError, match="The lxml backend requires"):
+        html_to_draftjs("<p>a</p>", features="html.parser", backend="lxml")
+
+
+def test_convert_error_shows_the_tag(backend):
+    """Tests the errors show the markup of the offending tag."""
+    with pytest.raises(ValueError) as exc_info:
+        html_to_draftjs(
+            "<p><font color='red'>x<br>y</font></p>", strict=True, backend=backend
+        )
+    assert repr(exc_info.value.args[2]) == '<font color="red">x<br/>y</font>'
+
+
+PAGE = (
+    "<html><body><nav><ul><li><a href='/'>Home</a></li></ul></nav>"
+    "<div id='content' class='article main' data-kind='news'>"
+    "<h1>Title</h1><p>Some <b>text</b> <a href='/more'>link</a></p>"
+    "<ul><li>item</li></ul></div>"
+    "<div class='article'><p>Other</p></div>"
+    "<footer><p>Footer <a href='/legal'>legal</a></p></footer></body></html>"
+)
+
+PAGE_CONTENT_BLOCKS = [
+    ("header-one", "Title"),
+    ("unstyled", "Some text link"),
+    ("unordered-list-item", "item"),
+]
+
+
+@pytest.mark.parametrize(
+    "selector",
+    (
+        "#content",
+        "div.article",
+        ".main.article",
+        "div#content.article",
+        "[data-kind]",
+        "[data-kind='news']",
+    ),
+)
+@pytest.mark.parametrize(
+    "features, backend",
+    (("lxml", "lxml"), ("lxml", "bs4"), ("html.parser", None), ("html5lib", None)),
+)
+def test_convert_selector(features, backend, selector):
+    """Tests only converting the element matching a selector."""
+    result = html_to_draftjs(PAGE, features, backend=backend, selector=selector)
+    blocks = [(block["type"], block["text"]) for block in result["blocks"]]
+    assert blocks == PAGE_CONTENT_BLOCKS
+    assert result["entityMap"] == {
+        "0": {"type": "LINK", "mutability": "MUTABLE", "data": {"url": "/more"}}
+    }
+
+
+def test_convert_complex_selector(backend):
+    """Tests the selectors which cannot be matched while parsing."""
+    if backend == "lxml":
+        with pytest.raises(ValueError, match="Unsupported selector"):
+            html_to_draftjs(PAGE, selector="body > div:first-of-type", backend=backend)
+        return
+
+    result = html_to_draftjs(PAGE, selector="body > div:first-of-type", backend=backend)
+    blocks = [(block["type"], block["text"]) for block in result["blocks"]]
+    assert blocks == PAGE_CONTENT_BLOCKS
+
+
+def test_convert_selector_not_found(backend):
+    """Tests nothing is converted when the selector doesn't match."""
+    result = html_to_draftjs(PAGE, selector="#missing", backend=backend)
+    assert result == {"entityMap": {}, "blocks": []}
+
+
+def test_convert_root():
+    """Tests converting an element of a soup instead of its body."""
+    soup = bs4.BeautifulSoup(PAGE, "lxml")
+    converter = SoupConverter()
+
+    result = converter.convert(soup, root=soup.find("footer")).to_dict()
+    assert [block["text"] for block in result["blocks"]] == ["Footer legal"]
+
+    with pytest.raises(ValueError, match="either a root element or a selector"):
+        converter.convert(soup, root=soup.find("footer"), selector="#content")
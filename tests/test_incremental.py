@@ -0,0 +1,98 @@
+import itertools
+
+import pytest
+
+from html_to_draftjs import (
+    IncrementalResult,
+    html_to_draftjs,
+    html_to_draftjs_incremental,
+)
+from html_to_draftjs.converter import SoupConverter
+from html_to_draftjs.lxml_tree import LxmlConverter
+
+HTML = (
+    "<html><body><h1>Title</h1><p>Some <a href='/a'>link</a></p>"
+    "<ul><li>one <a href='/b'>b</a></li><li>two</li></ul><p>end</p></body></html>"
+)
+EDITED_HTML = HTML.replace("<p>end</p>", "<p>new <a href='/c'>end</a></p>")
+
+
+@pytest.fixture(params=("lxml", "html.parser"))
+def features(request):
+    return request.param
+
+
+def make_converter(features):
+    counter = itertools.count()
+    converter_class = LxmlConverter if features == "lxml" else SoupConverter
+    return converter_class(key_generator=lambda block: "k%d" % next(counter))
+
+
+def get_keys(result):
+    return {block["text"]: block["key"] for block in result["blocks"]}
+
+
+def test_incremental(features):
+    """Tests only the changed top-level block elements are converted again."""
+    converter = make_converter(features)
+
+    first = html_to_draftjs_incremental(None, None, HTML, features, converter=converter)
+    assert isinstance(first, IncrementalResult)
+    assert (first.reused, first.converted) == (0, 4)
+    assert [dict(block, key="") for block in first.result["blocks"]] == (
+        html_to_draftjs(HTML, features)["blocks"]
+    )
+
+    second = html_to_draftjs_incremental(
+        HTML, first, EDITED_HTML, features, converter=converter
+    )
+    assert (second.reused, second.converted) == (3, 1)
+
+    # The unchanged blocks keep their key
+    keys = get_keys(second.result)
+    previous_keys = get_keys(first.result)
+    assert keys.pop("new end") not in previous_keys.values()
+    del previous_keys["end"]
+    assert keys == previous_keys
+
+    # The entities are the ones of a full conversion
+    expected = html_to_draftjs(EDITED_HTML, features)
+    assert second.result["entityMap"] == expected["entityMap"]
+    assert [dict(block, key="") for block in second.result["blocks"]] == (
+        expected["blocks"]
+    )
+
+
+def test_incremental_from_result(features):
+    """Tests reusing the keys of a result which is not an incremental result."""
+    converter = make_converter(features)
+
+    previous = html_to_draftjs_incremental(
+        None, None, HTML, features, converter=converter
+    ).result
+
+    result = html_to_draftjs_incremental(
+        HTML, previous, EDITED_HTML, features, converter=converter
+    )
+    assert (result.reused, result.converted) == (3, 1)
+
+    keys = get_keys(result.result)
+    previous_keys = get_keys(previous)
+    del keys["new end"], previous_keys["end"]
+    assert keys == previous_keys
+
+
+def test_incremental_duplicated_blocks():
+    """Tests the keys of an unchanged block are only reused once."""
+    converter = make_converter("lxml")
+    html = "<p>a</p><p>b</p>"
+
+    first = html_to_draftjs_incremental(None, None, html, converter=converter)
+    second = html_to_draftjs_incremental(
+        html, first, html + "<p>a</p>", converter=converter
+    )
+
+    assert (second.reused, second.converted) == (2, 1)
+    keys = [block["key"] for block in second.result["blocks"]]
+    assert keys[:2] == [block["key"] for block in first.result["blocks"]]
+    assert len(set(keys)) == 3
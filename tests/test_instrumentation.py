@@ -0,0 +1,45 @@
+import pytest
+
+from html_to_draftjs import Instrumentation, html_to_draftjs, html_to_draftjs_stream
+
+HTML = (
+    "<body><p>Some <b>bold</b> text with <a href='#'>a link</a></p>"
+    "<div><p></p></div><p><span>unsupported</span><img src='a.png'/></p></body>"
+)
+
+
+@pytest.mark.filterwarnings("ignore")
+@pytest.mark.parametrize(
+    "convert, phases",
+    (
+        (html_to_draftjs, {"parse", "walk", "entities", "clean"}),
+        (html_to_draftjs_stream, {"walk", "entities", "clean"}),
+    ),
+)
+def test_instrumentation(convert, phases):
+    """Tests the timings and counters are recorded."""
+    instrumentation = Instrumentation()
+    convert(HTML, instrumentation=instrumentation)
+    records = instrumentation.as_dict()
+
+    assert set(records["timings"]) == phases
+    assert all(timing >= 0 for timing in records["timings"].values())
+    assert records["counters"] == {
+        "nodes": 12,
+        "blocks": 2,
+        "empty_blocks": 3,
+        "entities": 2,
+        "warnings": 1,
+        "max_depth": 3,
+    }
+
+
+def test_instrumentation_accumulates():
+    """Tests the records of several conversions are accumulated."""
+    instrumentation = Instrumentation()
+    html_to_draftjs("<p><b><i>a</i></b></p>", instrumentation=instrumentation)
+    html_to_draftjs("<p>b</p><p>c</p>", instrumentation=instrumentation)
+
+    counters = instrumentation.as_dict()["counters"]
+    assert counters["blocks"] == 3
+    assert counters["max_depth"] == 4
@@ -0,0 +1,59 @@
+import bs4
+import pytest
+
+from html_to_draftjs import html_to_draftjs, html_to_draftjs_iter
+from html_to_draftjs.converter import SoupConverter
+from html_to_draftjs.stream import CHUNK_SIZE, StreamConverter
+
+
+@pytest.mark.parametrize("features", ("lxml", "html.parser", "html5lib"))
+def test_iter_blocks(features):
+    """Tests the blocks are yielded along with the entities they reference."""
+    html = (
+        "<body><p>hello <a href='#link'>world</a></p><div></div>"
+        "<p><img src='a.png'/><img src='b.png'/></p></body>"
+    )
+    expected = html_to_draftjs(html, features)
+    blocks = list(html_to_draftjs_iter(html, features))
+
+    assert [block for block, _ in blocks] == expected["blocks"]
+    assert [entity_map for _, entity_map in blocks] == [
+        {"0": expected["entityMap"]["0"]},
+        {"1": expected["entityMap"]["1"], "2": expected["entityMap"]["2"]},
+    ]
+
+
+@pytest.mark.parametrize("features", ("lxml", "html.parser", "html5lib"))
+def test_iter_blocks_empty(features):
+    """Tests iterating the blocks of empty HTML doesn't fail."""
+    assert list(html_to_draftjs_iter("", features)) == []
+
+
+def test_iter_blocks_nested_blocks_order():
+    """Tests nested blocks are yielded before the block containing them."""
+    html = "<blockquote>quote<p>nested</p></blockquote>"
+    texts = [block["text"] for block, _ in html_to_draftjs_iter(html)]
+    assert texts == ["nested", "quote"]
+
+
+def test_iter_blocks_is_incremental():
+    """Tests the first blocks are yielded before the whole HTML was parsed."""
+    paragraph = "<p>paragraph</p>"
+    count = CHUNK_SIZE // len(paragraph) * 3
+    html = paragraph * count
+    finished_blocks = []
+
+    def key_generator(block):
+        finished_blocks.append(block)
+        return ""
+
+    converter = SoupConverter(key_generator=key_generator)
+    iterator = converter.iter_blocks(bs4.BeautifulSoup(html, "lxml"))
+    next(iterator)
+    assert len(finished_blocks) == 1
+
+    finished_blocks.clear()
+    iterator = StreamConverter(key_generator=key_generator).iter_blocks(html)
+    block, _ = next(iterator)
+    assert block["text"] == "paragraph"
+    assert 0 < len(finished_blocks) < count
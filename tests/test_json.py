@@ -0,0 +1,55 @@
+import io
+import json
+
+import bs4
+import pytest
+
+from html_to_draftjs import html_to_draftjs, html_to_draftjs_json, serialization
+from html_to_draftjs.converter import SoupConverter
+
+HTML = (
+    '<h1>Title with "quotes" and \\ backslash</h1>'
+    "<p>Héllo <b>wörld</b> 🎉 <i>x</i><a href='/a?b=\"c\"'>link</a>\n"
+    "<img src='a.png' height='12'/><br/>tab\tend</p>"
+    "<blockquote><p>quote</p></blockquote><div></div>"
+)
+
+
+@pytest.fixture(params=("orjson", "json"))
+def json_backend(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    return request.param
+
+
+@pytest.mark.parametrize("features", ("lxml", "html.parser", "html5lib"))
+def test_html_to_draftjs_json(json_backend, features):
+    """Tests the JSON is the serialization of the converted data."""
+    expected = html_to_draftjs(HTML, features)
+
+    result = html_to_draftjs_json(HTML, features)
+    assert json.loads(result) == expected
+    assert list(json.loads(result)) == ["entityMap", "blocks"]
+
+    fp = io.BytesIO()
+    assert html_to_draftjs_json(HTML, features, fp=fp) is None
+    assert json.loads(fp.getvalue().decode("utf-8")) == expected
+
+
+def test_write_json_by_chunks(json_backend, monkeypatch):
+    """Tests the JSON is written by chunks."""
+    monkeypatch.setattr(serialization, "WRITE_BUFFER_SIZE", 10)
+    soup = bs4.BeautifulSoup(HTML * 3, "lxml")
+    converter = SoupConverter(dedupe_entities=True)
+
+    fp = io.BytesIO()
+    converter.convert(soup).write_json(fp)
+    assert json.loads(fp.getvalue()) == converter.convert(soup).to_dict()
+
+
+def test_to_json_empty(json_backend):
+    """Tests serializing an empty document."""
+    session = SoupConverter().convert(bs4.BeautifulSoup("", "lxml"))
+    assert json.loads(session.to_json()) == {"entityMap": {}, "blocks": []}
@@ -0,0 +1,65 @@
+import bs4
+
+from html_to_draftjs.converter import SoupConverter
+from html_to_draftjs.model import Block, register_style
+
+
+def test_block_mapping():
+    """Tests a block can be read as its Draft JS dictionary."""
+    block = Block("header-one")
+    block.text = "hello"
+    block.add_style_range(3, 2, register_style("ITALIC"))
+    block.add_style_range(0, 5, register_style("BOLD"))
+    block.add_entity_range(0, 1, 2)
+    block.add_entity_range(0, 5, 1)
+
+    block.sort_ranges()
+    expected = {
+        "key": "",
+        "text": "hello",
+        "type": "header-one",
+        "depth": 0,
+        "inlineStyleRanges": [
+            {"offset": 0, "length": 5, "style": "BOLD"},
+            {"offset": 3, "length": 2, "style": "ITALIC"},
+        ],
+        "entityRanges": [
+            {"offset": 0, "length": 5, "key": 1},
+            {"offset": 0, "length": 1, "key": 2},
+        ],
+        "data": {},
+    }
+    assert block.to_dict() == expected
+    assert dict(block) == expected
+    assert block == expected
+    assert list(block.entity_keys) == [1, 2]
+
+
+def test_block_copy():
+    """Tests a copied block doesn't share its ranges."""
+    block = Block()
+    block.add_entity_range(0, 1, 0)
+
+    copy = block.copy()
+    copy.remap_entity_keys({0: 5})
+    assert list(block.entity_keys) == [0]
+    assert list(copy.entity_keys) == [5]
+
+
+def test_convert_to_blocks():
+    """Tests the blocks can be read without building their dictionaries."""
+    soup = bs4.BeautifulSoup("<p>a <b>b</b></p><div></div><h1>c</h1>", "lxml")
+    keys = []
+
+    def key_generator(block):
+        keys.append((block["text"], block["inlineStyleRanges"]))
+        return str(len(keys))
+
+    session = SoupConverter(key_generator=key_generator).convert(soup)
+    blocks = session.to_blocks()
+    assert [(block.key, block.text, block.type) for block in blocks] == [
+        ("1", "a b", "unstyled"),
+        ("2", "c", "header-one"),
+    ]
+    assert keys == [("a b", [{"offset": 2, "length": 1, "style": "BOLD"}]), ("c", [])]
+    assert session.to_dict()["blocks"] == [block.to_dict() for block in blocks]
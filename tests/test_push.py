@@ -0,0 +1,78 @@
+import pytest
+
+from html_to_draftjs import html_to_draftjs, html_to_draftjs_push
+
+HTML = (
+    "<html><body><h1>Titlé</h1><p>Some <b>text</b> <a href='/a'>link</a></p>"
+    "<ul><li>one</li><li>two <img src='a.png'/></li></ul><p>end</p></body></html>"
+)
+
+
+@pytest.fixture(params=("lxml", "html.parser"))
+def features(request):
+    return request.param
+
+
+def get_texts(blocks):
+    return [block["text"] for block, _ in blocks]
+
+
+def test_push(features):
+    """Tests the blocks are returned as soon as their tag is closed."""
+    session = html_to_draftjs_push(features)
+
+    assert session.feed("<html><body><p>a</p><p>b") == [
+        (
+            {
+                "key": "",
+                "text": "a",
+                "type": "unstyled",
+                "depth": 0,
+                "inlineStyleRanges": [],
+                "entityRanges": [],
+                "data": {},
+            },
+            {},
+        )
+    ]
+    assert get_texts(session.feed("</p><ul><li>x <a href='/x'>y</a></li>")) == [
+        "b",
+        "x y",
+    ]
+    assert get_texts(session.feed("<li>z")) == []
+    assert get_texts(session.close()) == ["z"]
+
+    with pytest.raises(ValueError, match="closed"):
+        session.feed("<p>")
+
+
+@pytest.mark.parametrize("chunk_size", (1, 7, 64))
+def test_push_chunks(features, chunk_size):
+    """Tests pushing the HTML by chunks, as text or bytes."""
+    expected = html_to_draftjs(HTML, features)
+
+    for html in (HTML, HTML.encode("utf-8")):
+        session = html_to_draftjs_push(features)
+        blocks = []
+        for start in range(0, len(html), chunk_size):
+            end = start + chunk_size
+            blocks.extend(session.feed(html[start:end]))
+        blocks.extend(session.close())
+
+        entity_map = {}
+        for _, entities in blocks:
+            entity_map.update(entities)
+
+        assert entity_map == expected["entityMap"]
+        assert sorted(block["text"] for block, _ in blocks) == sorted(
+            block["text"] for block in expected["blocks"]
+        )
+
+
+def test_push_close_without_chunks(features):
+    """Tests closing a session which was never fed, such as an empty upload."""
+    assert html_to_draftjs_push(features).close() == []
+
+    session = html_to_draftjs_push(features)
+    assert session.feed(b"") == []
+    assert session.close() == []
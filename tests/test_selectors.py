@@ -0,0 +1,43 @@
+import pytest
+
+from html_to_draftjs.selectors import SimpleSelector, parse_simple_selector
+
+
+@pytest.mark.parametrize(
+    "selector, expected",
+    (
+        ("div", SimpleSelector("div", frozenset(), ())),
+        ("#content", SimpleSelector(None, frozenset(), (("id", "content"),))),
+        (
+            "DIV.a.b[data-x='1'][hidden]",
+            SimpleSelector(
+                "div", frozenset(("a", "b")), (("data-x", "1"), ("hidden", None))
+            ),
+        ),
+        ("div p", None),
+        ("ul > li", None),
+        ("li:first-child", None),
+        ("h1, h2", None),
+        ("*", None),
+        ("", None),
+    ),
+)
+def test_parse_simple_selector(selector, expected):
+    """Tests parsing the selectors matching a single element."""
+    assert parse_simple_selector(selector) == expected
+
+
+@pytest.mark.parametrize(
+    "name, attrs, expected",
+    (
+        ("div", {"class": "b x a", "data-x": "1", "hidden": ""}, True),
+        ("p", {"class": "b x a", "data-x": "1", "hidden": ""}, False),
+        ("div", {"class": "a", "data-x": "1", "hidden": ""}, False),
+        ("div", {"class": "a b", "data-x": "2", "hidden": ""}, False),
+        ("div", {"class": "a b", "data-x": "1"}, False),
+    ),
+)
+def test_simple_selector_matches(name, attrs, expected):
+    """Tests matching an element by its tag name and attributes."""
+    selector = parse_simple_selector("div.a.b[data-x='1'][hidden]")
+    assert selector.matches(name, attrs) is expected
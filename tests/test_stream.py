@@ -0,0 +1,54 @@
+import pytest
+
+from html_to_draftjs import html_to_draftjs, html_to_draftjs_stream
+from html_to_draftjs.stream import StreamConverter
+
+PARITY_CASES = (
+    "",
+    "<p>My content has <strong>some <em>content</em></strong></p>",
+    "My content has <strong>some <em>content</em></strong><p>A paragraph here</p>",
+    "<p><img src='picture.png'>Invalid</img><img src='picture2.png' /></p>",
+    "hello <a href='#my-link'>worl<strong>d</strong></a>",
+    "<ul><li>a</li><li>b</li></ul><ol><li>a</li></ol>",
+    "<blockquote>\n  <p>Lorem,<br/>ipsum.</p>\n</blockquote>\n\n<h3>Title</h3>",
+    "<p>a <!-- comment --> b</p><pre> \n </pre>",
+    "<p><b><div>block in inline</div></b></p>",
+)
+
+
+@pytest.mark.parametrize("features", ("lxml", "html.parser"))
+@pytest.mark.parametrize("html", PARITY_CASES)
+def test_stream_parity(html, features):
+    """Tests the stream converter generates the same output than the soup one."""
+    html = "<body>{}</body>".format(html)
+    assert html_to_draftjs_stream(html, features) == html_to_draftjs(html, features)
+
+
+@pytest.mark.filterwarnings("ignore")
+def test_stream_skips_unsupported_tags():
+    """Tests the content of unsupported tags is ignored in non-strict mode."""
+    html = "<p>a<span>b<b>c</b></span>d</p>"
+    assert html_to_draftjs_stream(html)["blocks"][0]["text"] == "ad"
+
+
+@pytest.mark.parametrize(
+    "html",
+    ("<p><span>unsupported</span></p>", "<p><b><i><div>invalid</div></i></b></p>"),
+)
+def test_stream_strict_mode(html):
+    """Tests the errors are raised from the parser in strict mode."""
+    with pytest.raises(ValueError):
+        html_to_draftjs_stream(html, strict=True)
+
+
+def test_stream_unsupported_parser():
+    with pytest.raises(ValueError):
+        html_to_draftjs_stream("<p>a</p>", features="html5lib")
+
+
+def test_stream_max_depth():
+    """Tests the elements deeper than the maximum depth are skipped."""
+    html = "<p>a<b>b<i>c</i></b></p>"
+    with pytest.warns(UserWarning, match="Maximum nesting depth exceeded"):
+        json = StreamConverter(max_depth=3).convert(html).to_dict()
+    assert json["blocks"][0]["text"] == "ab"